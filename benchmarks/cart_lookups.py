@@ -0,0 +1,219 @@
+"""
+Benchmark of cart lookups on a large carts table
+
+Run it from a project with `ok_cart` installed and migrated:
+
+    DJANGO_SETTINGS_MODULE=project.settings \
+        python benchmarks/cart_lookups.py --carts 2000000
+
+Carts and items are generated with `generate_series` inside a transaction,
+which is rolled back at the end, so the database is left untouched.
+Every lookup is measured with ok_cart indexes and after dropping them
+in the same transaction.
+"""
+import argparse
+import random
+import statistics
+import time
+
+import django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--carts', type=int, default=2_000_000)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--items', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=200)
+    return parser.parse_args()
+
+
+class Rollback(Exception):
+    pass
+
+
+def populate(*, carts: int, users: int, items: int) -> None:
+    from django.contrib.auth import get_user_model
+    from django.contrib.contenttypes.models import ContentType
+    from django.db import connection
+
+    from ok_cart.models import Cart, CartItem
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        [
+            User(**{User.USERNAME_FIELD: f'ok-cart-benchmark-{i}'})
+            for i in range(users)
+        ],
+        batch_size=1000
+    )
+    user_ids = list(
+        User.objects
+        .filter(**{
+            f'{User.USERNAME_FIELD}__startswith': 'ok-cart-benchmark-'
+        })
+        .order_by('pk')
+        .values_list('pk', flat=True)
+    )
+    content_type = ContentType.objects.get_for_model(User)
+
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE TEMPORARY TABLE ok_cart_benchmark_users '
+                       '(n integer PRIMARY KEY, user_id integer)')
+        cursor.executemany(
+            'INSERT INTO ok_cart_benchmark_users VALUES (%s, %s)',
+            list(enumerate(user_ids, start=1))
+        )
+        # one opened cart per user, 10% of anonymous carts are opened
+        cursor.execute(
+            f'''
+            INSERT INTO {Cart._meta.db_table} (
+                uuid, created_at, updated_at, status, user_id,
+                session_key, quantity, total_price, parameters, version
+            )
+            SELECT
+                md5(i::text)::uuid, now(), now(),
+                CASE WHEN i <= %(users)s OR i %% 10 = 0
+                    THEN 'opened' ELSE 'closed' END,
+                u.user_id, md5('session' || i::text),
+                0, 0, '{{}}', 0
+            FROM generate_series(1, %(carts)s) AS i
+            LEFT JOIN ok_cart_benchmark_users AS u ON u.n = i
+            ''',
+            {'carts': carts, 'users': len(user_ids)}
+        )
+        cursor.execute(
+            f'''
+            INSERT INTO {CartItem._meta.db_table} (
+                created_at, updated_at, content_type_id, object_id,
+                price, quantity, parameters
+            )
+            SELECT now(), now(), %(content_type)s, (i %% 100000)::text,
+                0, 1, '{{}}'
+            FROM generate_series(1, %(items)s) AS i
+            ''',
+            {'items': items, 'content_type': content_type.pk}
+        )
+        cursor.execute(f'ANALYZE {Cart._meta.db_table}')
+        cursor.execute(f'ANALYZE {CartItem._meta.db_table}')
+
+
+def get_lookups(*, carts: int):
+    from django.contrib.auth import get_user_model
+    from django.contrib.contenttypes.models import ContentType
+
+    from ok_cart.models import CartItem
+    from ok_cart.selectors import (
+        get_or_create_anonymous_cart,
+        get_or_create_user_cart
+    )
+
+    User = get_user_model()
+    user_ids = list(
+        User.objects
+        .filter(**{
+            f'{User.USERNAME_FIELD}__startswith': 'ok-cart-benchmark-'
+        })
+        .values_list('pk', flat=True)
+    )
+    content_type = ContentType.objects.get_for_model(User)
+
+    def anonymous_cart():
+        # only opened carts have i divisible by 10
+        i = random.randrange(10, carts, 10)
+        get_or_create_anonymous_cart(session_key=md5(f'session{i}'))
+
+    def user_cart():
+        get_or_create_user_cart(user=User(pk=random.choice(user_ids)))
+
+    def cart_items():
+        list(
+            CartItem.objects
+            .filter(
+                content_type=content_type,
+                object_id=str(random.randrange(100000))
+            )
+            .values_list('pk', flat=True)[:10]
+        )
+
+    return {
+        'opened cart by session key': anonymous_cart,
+        'opened cart by user': user_cart,
+        'cart items by object': cart_items,
+    }
+
+
+def md5(value: str) -> str:
+    from hashlib import md5 as _md5
+
+    return _md5(value.encode()).hexdigest()
+
+
+def measure(lookups, repeat: int):
+    results = {}
+
+    for name, lookup in lookups.items():
+        timings = []
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            lookup()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        results[name] = statistics.median(timings)
+
+    return results
+
+
+def drop_indexes() -> None:
+    from django.db import connection
+
+    from ok_cart.models import Cart, CartItem
+
+    names = [
+        index.name
+        for model in (Cart, CartItem)
+        for index in model._meta.indexes
+        if index.fields != ['created_at']
+    ] + [
+        constraint.name
+        for constraint in Cart._meta.constraints
+    ]
+
+    with connection.cursor() as cursor:
+        for name in names:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+
+
+def main():
+    args = parse_args()
+    django.setup()
+
+    from django.db import transaction
+
+    try:
+        with transaction.atomic():
+            print(f'Generating {args.carts} carts and {args.items} items...')
+            populate(carts=args.carts, users=args.users, items=args.items)
+            lookups = get_lookups(carts=args.carts)
+
+            indexed = measure(lookups, args.repeat)
+            drop_indexes()
+            not_indexed = measure(lookups, args.repeat)
+
+            print(f'{"lookup":<30}{"indexed, ms":>15}{"no index, ms":>15}')
+
+            for name in lookups:
+                print(
+                    f'{name:<30}'
+                    f'{indexed[name]:>15.3f}'
+                    f'{not_indexed[name]:>15.3f}'
+                )
+
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Comparison of two benchmarks results
+
+    python benchmarks/compare.py base.json head.json --threshold 10
+
+Prints median latency and queries of every case for both results.
+Exits with status 1 if any case became slower by more than given
+percent or makes more queries.
+"""
+import argparse
+import json
+import sys
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=10,
+        help='allowed median latency increase, percent'
+    )
+    return parser.parse_args()
+
+
+def load(path: str):
+    with open(path) as f:
+        data = json.load(f)
+
+    return data['meta'], {
+        (result['name'], result['groups']): result
+        for result in data['results']
+    }
+
+
+def main():
+    args = parse_args()
+    base_meta, base = load(args.base)
+    head_meta, head = load(args.head)
+    regressions = []
+
+    print(f'base: {base_meta.get("commit")}, head: {head_meta.get("commit")}')
+    print(
+        f'{"case":<55}{"groups":>7}'
+        f'{"base, ms":>11}{"head, ms":>11}{"delta":>9}'
+        f'{"queries":>11}'
+    )
+
+    for key in sorted(base.keys() & head.keys()):
+        name, groups = key
+        base_result, head_result = base[key], head[key]
+        delta = (
+            (head_result['median_ms'] - base_result['median_ms'])
+            / base_result['median_ms'] * 100
+        )
+        mark = ''
+
+        if (
+                delta > args.threshold
+                or head_result['queries'] > base_result['queries']
+        ):
+            mark = ' !'
+            regressions.append(key)
+
+        queries = f'{base_result["queries"]}->{head_result["queries"]}'
+        print(
+            f'{name:<55}{groups:>7}'
+            f'{base_result["median_ms"]:>11.3f}'
+            f'{head_result["median_ms"]:>11.3f}'
+            f'{delta:>+8.1f}%'
+            f'{queries:>11}{mark}'
+        )
+
+    for key in sorted(base.keys() ^ head.keys()):
+        print(f'{key[0]} ({key[1]} groups) is missing in '
+              f'{"head" if key in base else "base"}')
+
+    if regressions:
+        print(f'{len(regressions)} regressions')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Stress test of concurrent additions to the same cart
+
+Run it from a project with `ok_cart` installed and migrated:
+
+    DJANGO_SETTINGS_MODULE=project.settings \
+        python benchmarks/concurrent_adds.py --threads 16 --adds 50
+
+Every thread adds the same objects to one cart with its own database
+connection. Final quantities must match the number of additions and every
+object must have a single cart item. Created rows are deleted at the end.
+"""
+import argparse
+import sys
+import threading
+
+import django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--adds', type=int, default=50)
+    parser.add_argument('--objects', type=int, default=3)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from django.contrib.contenttypes.models import ContentType
+    from django.db import connection
+    from django.db.models import Count, Sum
+
+    from ok_cart.models import Cart, CartItem
+    from ok_cart.services import add_item_to_cart, update_cart_quantity_and_total_price
+
+    User = get_user_model()
+    users = [
+        User.objects.create(**{
+            User.USERNAME_FIELD: f'ok-cart-concurrency-{i}'
+        })
+        for i in range(args.objects)
+    ]
+    content_type = ContentType.objects.get_for_model(User)
+    cart = Cart.objects.create(session_key='ok-cart-concurrency')
+    barrier = threading.Barrier(args.threads)
+    errors = []
+
+    def worker():
+        try:
+            barrier.wait()
+
+            for _ in range(args.adds):
+                for user in users:
+                    add_item_to_cart(
+                        cart=Cart.objects.get(pk=cart.pk),
+                        user=None,
+                        content_type=content_type,
+                        object_id=user.pk,
+                        content_object=user,
+                    )
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=worker)
+        for _ in range(args.threads)
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    try:
+        update_cart_quantity_and_total_price(cart=cart)
+        cart.refresh_from_db()
+        items = (
+            CartItem.objects
+            .filter(groups__cart=cart)
+            .order_by()
+            .values('object_id')
+            .annotate(items=Count('pk'), quantity=Sum('quantity'))
+        )
+        expected = args.threads * args.adds
+        failed = bool(errors)
+
+        for error in errors:
+            print(f'Error: {error!r}')
+
+        for item in items:
+            print(
+                f'object {item["object_id"]}: {item["items"]} item(s), '
+                f'quantity {item["quantity"]} of {expected}'
+            )
+            failed |= item['items'] != 1 or item['quantity'] != expected
+
+        print(f'cart quantity {cart.quantity} of {expected * len(users)}')
+        failed |= cart.quantity != expected * len(users)
+    finally:
+        CartItem.objects.filter(groups__cart=cart).delete()
+        cart.delete()
+        User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+    print('FAILED' if failed else 'OK')
+    sys.exit(int(failed))
+
+
+if __name__ == '__main__':
+    main()
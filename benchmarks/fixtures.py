@@ -0,0 +1,146 @@
+"""
+Synthetic carts for benchmarks
+
+Cart elements are objects of models, available in every project:
+permissions, content types and auth groups, so benchmarks don't depend
+on project's models. Elements are represented with `ElementSerializer`,
+set for these models by `benchmark_settings`.
+"""
+import itertools
+from contextlib import contextmanager
+from typing import List, Optional
+
+from django.conf import settings as django_settings
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.test import override_settings
+from rest_framework import serializers
+
+from ok_cart.entities import CartItemEntity
+from ok_cart.models import Cart, CartGroup, CartItem
+from ok_cart.services import (
+    add_items_to_cart,
+    update_cart_quantity_and_total_price
+)
+
+ELEMENT_MODELS = (Permission, ContentType, Group)
+
+
+class ElementSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField(source='name')
+
+
+@contextmanager
+def benchmark_settings(**values):
+    """
+    Override cart settings for benchmarks, both as `CART_*` settings
+    and as keys of `CART` dict setting, if project uses it
+    """
+    values = {
+        'CART_ELEMENT_REPRESENTATION_SERIALIZERS': {
+            model._meta.label: (
+                f'{ElementSerializer.__module__}.ElementSerializer'
+            )
+            for model in ELEMENT_MODELS
+        },
+        **values
+    }
+
+    if hasattr(django_settings, 'CART'):
+        values = {'CART': {**django_settings.CART, **values}}
+
+    with override_settings(**values):
+        yield
+
+
+class ElementsPool:
+    """
+    Yields cart elements, cycling over content types,
+    so every cart has items of several types
+    """
+
+    def __init__(self, *, size: int):
+        Group.objects.bulk_create([
+            Group(name=f'ok-cart-benchmark-{i}')
+            for i in range(size)
+        ])
+        objects = [
+            list(model._base_manager.order_by('pk')[:size])
+            for model in ELEMENT_MODELS
+        ]
+        self.objects = [
+            obj
+            for chunk in itertools.zip_longest(*objects)
+            for obj in chunk
+            if obj is not None
+        ]
+
+    def take(self, count: int, offset: int = 0) -> List:
+        return [
+            self.objects[(offset + i) % len(self.objects)]
+            for i in range(count)
+        ]
+
+
+def get_entities(elements: List, quantity: int = 1) -> List[CartItemEntity]:
+    return [
+        CartItemEntity(
+            content_type=ContentType.objects.get_for_model(element),
+            object_id=element.pk,
+            content_object=element,
+            quantity=quantity,
+            parameters={'option': f'value {i}'}
+        )
+        for i, element in enumerate(elements)
+    ]
+
+
+def generate_cart(
+        *,
+        pool: 'ElementsPool',
+        groups: int,
+        relations: int = 0,
+        offset: int = 0,
+        user=None,
+        session_key: Optional[str] = ''
+) -> 'Cart':
+    """
+    Create cart with given number of groups, every one of them
+    with given number of related items
+    """
+    cart = Cart.objects.create(user=user, session_key=session_key or '')
+    add_items_to_cart(
+        cart=cart,
+        user=user,
+        entities=get_entities(pool.take(groups, offset=offset))
+    )
+
+    if relations:
+        cart_groups = list(CartGroup.objects.filter(cart=cart))
+        related_items = CartItem.objects.bulk_create([
+            CartItem(
+                cart=cart,
+                content_type=ContentType.objects.get_for_model(element),
+                object_id=str(element.pk),
+                content_object=element,
+                quantity=1,
+                price=1,
+            )
+            for i in range(len(cart_groups))
+            for element in pool.take(relations, offset=offset + i)
+        ])
+        CartGroup.relations.through.objects.bulk_create([
+            CartGroup.relations.through(
+                cartgroup_id=cart_group.pk,
+                cartitem_id=cart_item.pk
+            )
+            for i, cart_group in enumerate(cart_groups)
+            for cart_item in related_items[
+                i * relations:(i + 1) * relations
+            ]
+        ])
+
+    update_cart_quantity_and_total_price(cart=cart)
+
+    return Cart.objects.get(pk=cart.pk)
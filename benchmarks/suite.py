@@ -0,0 +1,411 @@
+"""
+Benchmarks of cart services, selectors and API views
+
+Run it from a project with `ok_cart` installed and migrated:
+
+    DJANGO_SETTINGS_MODULE=project.settings \
+        python benchmarks/suite.py --groups 10 100 --output base.json
+
+Every case is measured on carts with given numbers of groups (and related
+items per group) with elements of several content types. Latency and the
+number of queries are measured for every run, state changed by a run is
+rolled back with a savepoint. All generated data is rolled back at the end.
+
+Results are written as JSON and can be compared with
+`benchmarks/compare.py`.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import django
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--groups', type=int, nargs='+', default=[10, 100])
+    parser.add_argument('--relations', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument(
+        '--only',
+        nargs='*',
+        default=[],
+        help='run cases, which names contain any of given strings'
+    )
+    parser.add_argument(
+        '--output',
+        help='file to write results to, stdout by default'
+    )
+    return parser.parse_args()
+
+
+class Rollback(Exception):
+    pass
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def rollback():
+    from django.db import transaction
+
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def measure(case, *, repeat: int, warmup: int):
+    """
+    Run case's `setup` and `run` in a savepoint for every repeat,
+    only `run` is measured
+    """
+    from django.db import connection
+
+    timings = []
+    queries = []
+
+    for i in range(warmup + repeat):
+        with rollback():
+            state = case['setup']()
+            counter = QueryCounter()
+
+            with connection.execute_wrapper(counter):
+                start = time.perf_counter()
+                case['run'](state)
+                duration = (time.perf_counter() - start) * 1000
+
+        if i >= warmup:
+            timings.append(duration)
+            queries.append(counter.count)
+
+    timings.sort()
+
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[int(len(timings) * 0.95) - 1], 3),
+        'min_ms': round(timings[0], 3),
+        'queries': max(queries),
+        'repeat': repeat,
+    }
+
+
+def get_cases(*, pool, groups: int, relations: int):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory
+
+    from ok_cart.api.views import (
+        CartChangeAPIView,
+        CartClearAPIView,
+        CartQuantityRetrieveAPIView,
+        CartRetrieveAPIView
+    )
+    from ok_cart.models import Cart, CartItem
+    from ok_cart.selectors import (
+        get_cart_from_request,
+        get_cart_items_by_keys,
+        get_cart_quantity_and_total_price,
+        get_content_objects
+    )
+    from ok_cart.services import (
+        add_item_to_cart,
+        add_items_to_cart,
+        archive_carts,
+        clear_cart,
+        close_cart,
+        delete_carts,
+        merge,
+        update_cart_quantity_and_total_price
+    )
+
+    from fixtures import benchmark_settings, generate_cart, get_entities
+
+    User = get_user_model()
+    user = User.objects.create(**{
+        User.USERNAME_FIELD: f'ok-cart-benchmark-{groups}'
+    })
+    session = get_session()
+    cart = generate_cart(
+        pool=pool,
+        groups=groups,
+        relations=relations,
+        session_key=session.session_key
+    )
+    other_cart = generate_cart(
+        pool=pool,
+        groups=groups,
+        relations=relations,
+        offset=groups // 2,
+        user=user
+    )
+    new_elements = pool.take(10, offset=groups * (relations + 1))
+    cart_items = list(CartItem.objects.filter(cart=cart))
+    factory = RequestFactory()
+
+    def get_request(method: str = 'get', **kwargs):
+        request = getattr(factory, method)('/', **kwargs)
+        request.session = session
+        request.user = AnonymousUser()
+        return request
+
+    def fresh_cart():
+        return Cart.objects.get(pk=cart.pk)
+
+    def view(view_class, method: str = 'get', **kwargs):
+        view_func = view_class.as_view()
+
+        def run(state):
+            response = view_func(get_request(method, **kwargs))
+            response.render()
+            assert response.status_code == 200, response.content
+
+        return run
+
+    change_payload = json.dumps({
+        'entities': [
+            {
+                'element': {
+                    'type': element._meta.label_lower,
+                    'id': str(element.pk),
+                },
+                'quantity': 1,
+            }
+            for element in new_elements
+        ]
+    })
+    keys = [
+        (cart_item.content_type_id, cart_item.object_id)
+        for cart_item in cart_items
+    ]
+    content_types_keys = [
+        (cart_item.content_type, cart_item.object_id)
+        for cart_item in cart_items
+    ]
+
+    cases = {
+        'services.add_item_to_cart': {
+            'setup': lambda: (fresh_cart(), get_entities(new_elements[:1])),
+            'run': lambda state: add_item_to_cart(
+                cart=state[0],
+                user=None,
+                content_type=state[1][0].content_type,
+                object_id=state[1][0].object_id,
+                content_object=state[1][0].content_object,
+            ),
+        },
+        'services.add_items_to_cart': {
+            'setup': lambda: (fresh_cart(), get_entities(new_elements)),
+            'run': lambda state: add_items_to_cart(
+                cart=state[0],
+                user=None,
+                entities=state[1]
+            ),
+        },
+        'services.update_cart_quantity_and_total_price': {
+            'setup': fresh_cart,
+            'run': lambda state: (
+                update_cart_quantity_and_total_price(cart=state)
+            ),
+        },
+        'services.merge': {
+            'setup': lambda: [
+                Cart.objects.get(pk=other_cart.pk),
+                fresh_cart()
+            ],
+            'run': lambda state: merge(carts=state),
+        },
+        'services.clear_cart': {
+            'setup': fresh_cart,
+            'run': lambda state: clear_cart(cart=state),
+        },
+        'services.close_cart': {
+            'setup': fresh_cart,
+            'run': lambda state: close_cart(cart=state),
+        },
+        'services.delete_carts': {
+            'setup': lambda: None,
+            'run': lambda state: delete_carts(cart_pks=[cart.pk]),
+        },
+        'services.archive_carts': {
+            'setup': lambda: close_cart(cart=fresh_cart()),
+            'run': lambda state: archive_carts(cart_pks=[cart.pk]),
+        },
+        'selectors.get_cart_from_request': {
+            'setup': lambda: None,
+            'run': lambda state: get_cart_from_request(
+                request=get_request()
+            ),
+        },
+        'selectors.get_cart_quantity_and_total_price': {
+            'setup': lambda: None,
+            'run': lambda state: get_cart_quantity_and_total_price(
+                request=get_request()
+            ),
+        },
+        'selectors.get_cart_items_by_keys': {
+            'setup': lambda: None,
+            'run': lambda state: get_cart_items_by_keys(
+                cart=cart,
+                keys=keys
+            ),
+        },
+        'selectors.get_content_objects': {
+            'setup': lambda: None,
+            'run': lambda state: get_content_objects(keys=content_types_keys),
+        },
+        'selectors.cart_with_elements': {
+            'setup': lambda: None,
+            'run': lambda state: (
+                Cart.objects.with_elements().get(pk=cart.pk)
+            ),
+        },
+        'views.CartRetrieveAPIView': {
+            'setup': lambda: None,
+            'run': view(CartRetrieveAPIView),
+        },
+        'views.CartQuantityRetrieveAPIView': {
+            'setup': lambda: None,
+            'run': view(CartQuantityRetrieveAPIView),
+        },
+        'views.CartChangeAPIView': {
+            'setup': lambda: None,
+            'run': view(
+                CartChangeAPIView,
+                'post',
+                data=change_payload,
+                content_type='application/json'
+            ),
+        },
+        'views.CartClearAPIView': {
+            'setup': lambda: None,
+            'run': view(CartClearAPIView, 'post'),
+        },
+    }
+
+    # values render mode
+    for name in ('views.CartRetrieveAPIView', 'views.CartChangeAPIView'):
+        case = cases[name]
+        cases[f'{name}[values]'] = {
+            'setup': case['setup'],
+            'run': with_settings(
+                case['run'],
+                benchmark_settings,
+                CART_RENDER_MODE='values'
+            ),
+        }
+
+    return cases
+
+
+def with_settings(run, settings_context, **values):
+    def wrapper(state):
+        with settings_context(**values):
+            return run(state)
+
+    return wrapper
+
+
+def get_session():
+    from importlib import import_module
+
+    from django.conf import settings
+
+    session = import_module(settings.SESSION_ENGINE).SessionStore()
+    session.create()
+    return session
+
+
+def get_meta(args) -> dict:
+    from django.db import connection
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'groups': args.groups,
+        'relations': args.relations,
+        'repeat': args.repeat,
+    }
+
+
+def main():
+    args = parse_args()
+    django.setup()
+
+    from fixtures import ElementsPool, benchmark_settings
+
+    results = []
+
+    with benchmark_settings(), rollback():
+        meta = get_meta(args)
+        pool = ElementsPool(
+            size=max(args.groups) * (args.relations + 1) + 10
+        )
+
+        for groups in args.groups:
+            cases = get_cases(
+                pool=pool,
+                groups=groups,
+                relations=args.relations
+            )
+
+            for name, case in cases.items():
+                if args.only and not any(o in name for o in args.only):
+                    continue
+
+                result = {
+                    'name': name,
+                    'groups': groups,
+                    'relations': args.relations,
+                    **measure(case, repeat=args.repeat, warmup=args.warmup)
+                }
+                results.append(result)
+                print(
+                    f'{name:<55}{groups:>6}'
+                    f'{result["median_ms"]:>12.3f} ms'
+                    f'{result["queries"]:>6} queries',
+                    file=sys.stderr
+                )
+
+    output = json.dumps({'meta': meta, 'results': results}, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
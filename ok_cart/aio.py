@@ -0,0 +1,57 @@
+"""
+Async versions of cart's selectors and services for async code,
+like ASGI views or consumers, requires `asgiref`
+"""
+from typing import List, Optional, TYPE_CHECKING, Tuple
+
+from asgiref.sync import sync_to_async
+
+from .selectors import get_cart_from_request
+from .services import (
+    add_item_to_cart,
+    add_items_to_cart,
+    update_cart_quantity_and_total_price
+)
+
+if TYPE_CHECKING:
+    from .entities import CartItemEntity
+    from .models import Cart, CartGroup, CartItem
+
+__all__ = (
+    'aget_cart_from_request',
+    'aadd_item_to_cart',
+    'aadd_items_to_cart',
+    'aupdate_cart_quantity_and_total_price',
+)
+
+
+async def aget_cart_from_request(**kwargs) -> Optional['Cart']:
+    """
+    Async version of `get_cart_from_request`
+    """
+    return await sync_to_async(get_cart_from_request)(**kwargs)
+
+
+async def aadd_item_to_cart(
+        **kwargs
+) -> Tuple['CartItem', Optional['CartGroup']]:
+    """
+    Async version of `add_item_to_cart`
+    """
+    return await sync_to_async(add_item_to_cart)(**kwargs)
+
+
+async def aadd_items_to_cart(
+        **kwargs
+) -> List[Tuple['CartItemEntity', 'CartItem', Optional['CartGroup']]]:
+    """
+    Async version of `add_items_to_cart`
+    """
+    return await sync_to_async(add_items_to_cart)(**kwargs)
+
+
+async def aupdate_cart_quantity_and_total_price(*, cart: 'Cart') -> None:
+    """
+    Async version of `update_cart_quantity_and_total_price`
+    """
+    await sync_to_async(update_cart_quantity_and_total_price)(cart=cart)
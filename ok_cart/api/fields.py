@@ -1,7 +1,10 @@
 import json
 
 from django.contrib.contenttypes.models import ContentType
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import (
+    ObjectDoesNotExist,
+    ValidationError as DjangoValidationError
+)
 from django.utils.translation import ugettext_lazy as _
 
 from rest_framework import serializers
@@ -18,13 +21,12 @@ __all__ = (
 
 class JSONStringField(serializers.JSONField):
     def to_representation(self, value):
-        if not value:
+        # `JSONField` values are already decoded,
+        # raw ones are inserted by `CartJSONRenderer`
+        if not value or not isinstance(value, str):
             return value
 
-        try:
-            return json.loads(value)
-        except TypeError as e:
-            return value
+        return json.loads(value)
 
 
 class ContentTypeNaturalKeyField(serializers.CharField):
@@ -59,7 +61,19 @@ class ContentTypeNaturalKeyField(serializers.CharField):
 
 
 class CartItemElementRelatedField(serializers.RelatedField):
+    # elements, rendered in advance by groups serializers
+    rendered_elements_context_key = 'rendered_elements'
+
     def to_representation(self, value):
+        rendered_elements = self.context.get(
+            self.rendered_elements_context_key,
+            {}
+        )
+        key = (type(value), value.pk)
+
+        if key in rendered_elements:
+            return rendered_elements[key]
+
         return (
             cart_element_representation_serializer(
                 value=value,
@@ -69,6 +83,10 @@ class CartItemElementRelatedField(serializers.RelatedField):
 
 
 class ContentTypeSerializerField(serializers.Serializer):
+    default_error_messages = {
+        'invalid_id': _('Invalid object id.')
+    }
+
     type = ContentTypeNaturalKeyField(write_only=True)
     id = serializers.CharField(write_only=True)
 
@@ -80,6 +98,10 @@ class ContentTypeSerializerField(serializers.Serializer):
 
     def __init__(self, *args, **kwargs):
         self.natural_keys = kwargs.pop('natural_keys', [])
+        # list serializers resolve content objects for all items at once
+        self.resolve_content_object = (
+            kwargs.pop('resolve_content_object', True)
+        )
         super().__init__(*args, **kwargs)
 
     def validate(self, attrs):
@@ -95,13 +117,16 @@ class ContentTypeSerializerField(serializers.Serializer):
                 'type': _('Not allowed type')
             })
 
+        if not self.resolve_content_object:
+            return data
+
         try:
             content_object = (
                 ct.get_object_for_this_type(pk=data['id'])
             )
-        except ObjectDoesNotExist:
+        except (ObjectDoesNotExist, DjangoValidationError):
             raise serializers.ValidationError({
-                'id': _('Invalid object id.')
+                'id': self.error_messages['invalid_id']
             })
         else:
             data['content_object'] = content_object
@@ -0,0 +1,76 @@
+import re
+from typing import List
+from uuid import uuid4
+
+from rest_framework.renderers import JSONRenderer
+
+__all__ = (
+    'RawJSON',
+    'CartJSONRenderer',
+)
+
+
+class RawJSON:
+    """
+    Already encoded JSON text, inserted into response
+    by `CartJSONRenderer` as is, without parsing
+    """
+    __slots__ = ('text', )
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def __repr__(self):
+        return f'RawJSON({self.text!r})'
+
+
+class CartJSONRenderer(JSONRenderer):
+    """
+    JSON renderer, which inserts `RawJSON` values into rendered bytes
+
+    Raw values are encoded as unique placeholder strings
+    and replaced after the whole response is rendered.
+    """
+    supports_raw_json = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        raw_values: List[str] = []
+        token = uuid4().hex
+        base_encoder_class = self.encoder_class
+
+        class RawJSONEncoder(base_encoder_class):
+            def default(self, obj):
+                if isinstance(obj, RawJSON):
+                    raw_values.append(obj.text)
+                    return f'{token}:{len(raw_values) - 1}'
+
+                return super().default(obj)
+
+        self.encoder_class = RawJSONEncoder
+
+        try:
+            ret = super().render(
+                data,
+                accepted_media_type=accepted_media_type,
+                renderer_context=renderer_context
+            )
+        finally:
+            self.encoder_class = base_encoder_class
+
+        if not raw_values:
+            return ret
+
+        # raw texts are escaped like the rest of response
+        raw_values = [
+            text
+            .replace('\u2028', '\\u2028')
+            .replace('\u2029', '\\u2029')
+            .encode()
+            for text in raw_values
+        ]
+
+        return re.sub(
+            f'"{token}:(\\d+)"'.encode(),
+            lambda match: raw_values[int(match.group(1))],
+            ret
+        )
@@ -0,0 +1,219 @@
+from collections import defaultdict
+from typing import Dict, Optional, TYPE_CHECKING
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F, TextField
+from django.db.models.functions import Cast
+
+from .fields import JSONStringField
+from .renderers import RawJSON
+from .serializers import CartRetrieveSerializer
+from .utils import process_prices, render_elements
+from ..consts import CART_RENDER_MODE_VALUES
+from ..models import Cart, CartGroup, CartItem
+from ..selectors import get_content_objects
+from ..settings import settings
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+__all__ = (
+    'CartValuesRepresentation',
+    'get_cart_representation',
+    'get_cart_representation_queryset',
+)
+
+
+class CartValuesRepresentation:
+    """
+    Represents cart in the same shape as `CartRetrieveSerializer`,
+    built from `values()` of groups, relations and items
+    without instantiating them or nested serializers
+
+    Only content objects are fetched as model instances,
+    to be represented with `ELEMENT_REPRESENTATION_SERIALIZERS`.
+
+    With `CART_RAW_JSON_PARAMETERS` setting and a renderer,
+    supporting raw JSON, `parameters` of groups and items are read
+    as JSON text and inserted into response without decoding.
+    """
+    parameters_field = JSONStringField()
+
+    def __init__(self, instance: 'Cart', context: Dict = None):
+        self.instance = instance
+        self.context = context or {}
+        self._data = None
+
+    @property
+    def data(self) -> Dict:
+        if self._data is None:
+            self._data = self.to_representation(self.instance)
+
+        return self._data
+
+    @property
+    def raw_json_parameters(self) -> bool:
+        request = self.context.get('request')
+
+        return settings.RAW_JSON_PARAMETERS and getattr(
+            getattr(request, 'accepted_renderer', None),
+            'supports_raw_json',
+            False
+        )
+
+    def get_parameters_expression(self):
+        if self.raw_json_parameters:
+            return Cast('parameters', TextField())
+
+        return F('parameters')
+
+    def represent_parameters(self, row: Dict):
+        parameters = row['parameters_value']
+
+        if self.raw_json_parameters and parameters is not None:
+            return RawJSON(parameters)
+
+        return self.parameters_field.to_representation(parameters)
+
+    def to_representation(self, cart: 'Cart') -> Dict:
+        parameters = self.get_parameters_expression()
+        cart_groups = list(
+            CartGroup.objects
+            .filter(cart=cart)
+            .values(
+                'id',
+                'base_id',
+                'price',
+                'quantity',
+                parameters_value=parameters
+            )
+        )
+        relations = defaultdict(list)
+
+        for cart_group_id, cart_item_id in (
+                CartGroup.relations.through.objects
+                .filter(cartgroup__cart=cart)
+                .order_by('-cartitem__created_at')
+                .values_list('cartgroup_id', 'cartitem_id')
+        ):
+            relations[cart_group_id].append(cart_item_id)
+
+        cart_items = {
+            cart_item['id']: cart_item
+            for cart_item in (
+                CartItem.objects
+                .filter(cart=cart)
+                .values(
+                    'id',
+                    'content_type_id',
+                    'object_id',
+                    'quantity',
+                    'price',
+                    parameters_value=parameters
+                )
+            )
+        }
+        elements = self.get_elements(cart_items=cart_items.values())
+        prices = {(Cart, cart.pk): cart.total_price}
+        prices.update({
+            (CartGroup, cart_group['id']): cart_group['price']
+            for cart_group in cart_groups
+        })
+        prices.update({
+            (CartItem, cart_item['id']): cart_item['price']
+            for cart_item in cart_items.values()
+        })
+        prices = process_prices(
+            request=self.context.get('request'),
+            prices=prices
+        )
+
+        def represent_item(cart_item_id: int) -> Optional[Dict]:
+            cart_item = cart_items.get(cart_item_id)
+
+            if cart_item is None:
+                return None
+
+            return {
+                'id': cart_item['id'],
+                'element': elements.get(
+                    (cart_item['content_type_id'], cart_item['object_id'])
+                ),
+                'quantity': cart_item['quantity'],
+                'price': prices[(CartItem, cart_item['id'])],
+                'parameters': self.represent_parameters(cart_item),
+            }
+
+        return {
+            'groups': [
+                {
+                    'id': cart_group['id'],
+                    'price': prices[(CartGroup, cart_group['id'])],
+                    'quantity': cart_group['quantity'],
+                    'base': represent_item(cart_group['base_id']),
+                    'relations': [
+                        represent_item(cart_item_id)
+                        for cart_item_id in relations[cart_group['id']]
+                    ],
+                    'parameters': self.represent_parameters(cart_group),
+                }
+                for cart_group in cart_groups
+            ],
+            'quantity': cart.quantity,
+            'total_price': prices[(Cart, cart.pk)],
+            'parameters': self.parameters_field.to_representation(
+                cart.parameters
+            ),
+        }
+
+    def get_elements(self, *, cart_items) -> Dict:
+        """
+        Represent content objects of given items,
+        keyed by `(content_type_id, object_id)`
+        """
+        cart_items = list(cart_items)
+        content_objects = get_content_objects(
+            keys=[
+                (
+                    ContentType.objects.get_for_id(
+                        cart_item['content_type_id']
+                    ),
+                    cart_item['object_id']
+                )
+                for cart_item in cart_items
+            ]
+        )
+        rendered_elements = render_elements(
+            elements=content_objects.values(),
+            serializer_context=self.context
+        )
+
+        return {
+            key: rendered_elements[(type(content_object), content_object.pk)]
+            for key, content_object in content_objects.items()
+        }
+
+
+def get_cart_representation(
+        *,
+        cart: 'Cart',
+        context: Dict
+):
+    """
+    Returns cart's representation for `CART_RENDER_MODE` setting
+    """
+    if settings.RENDER_MODE == CART_RENDER_MODE_VALUES:
+        return CartValuesRepresentation(instance=cart, context=context)
+
+    return CartRetrieveSerializer(instance=cart, context=context)
+
+
+def get_cart_representation_queryset(queryset: 'QuerySet') -> 'QuerySet':
+    """
+    Returns carts queryset, optimized for `CART_RENDER_MODE` setting
+    """
+    if settings.RENDER_MODE == CART_RENDER_MODE_VALUES:
+        # groups and items are fetched by the representation
+        return queryset.prefetch_related(None)
+
+    return queryset.with_elements()
@@ -1,3 +1,5 @@
+from typing import Dict
+
 from rest_framework import serializers
 
 from .fields import (
@@ -5,19 +7,92 @@ from .fields import (
     CartItemElementRelatedField,
     ContentTypeSerializerField
 )
+from .utils import process_prices, render_elements
 from ..models import Cart, CartItem, CartGroup
+from ..selectors import get_content_objects
 from ..settings import settings
 
 __all__ = (
+    'PriceProcessingMixin',
+    'CartItemElementListSerializer',
     'CartItemElementSerializer',
     'CartChangeSerializer',
     'CartItemRetrieveSerializer',
+    'CartGroupRetrieveListSerializer',
     'CartGroupRetrieveSerializer',
     'CartRetrieveSerializer',
     'CartQuantityRetrieveSerializer'
 )
 
 
+class CartItemElementListSerializer(serializers.ListSerializer):
+    """
+    Validates entities and fetches their content objects
+    with one query per content type
+    """
+
+    def to_internal_value(self, data):
+        element_field = self.child.fields['element']
+        element_field.resolve_content_object = False
+
+        try:
+            entities = super().to_internal_value(data)
+        finally:
+            element_field.resolve_content_object = True
+
+        content_objects = get_content_objects(
+            keys=[
+                (entity['element']['type'], entity['element']['id'])
+                for entity in entities
+            ]
+        )
+        errors = []
+
+        for entity in entities:
+            element = entity['element']
+            content_object = content_objects.get(
+                (element['type'].pk, str(element['id']))
+            )
+
+            if content_object is None:
+                errors.append({
+                    'element': {
+                        'id': [element_field.error_messages['invalid_id']]
+                    }
+                })
+            else:
+                element['content_object'] = content_object
+                errors.append({})
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return entities
+
+
+class PriceProcessingMixin:
+    """
+    Returns prices, processed in advance by root serializer,
+    or processes a single price
+    """
+    processed_prices_context_key = 'processed_prices'
+
+    def process_price(self, instance, price):
+        processed_prices = self.context.get(
+            self.processed_prices_context_key,
+            {}
+        )
+        key = (type(instance), getattr(instance, 'pk', None))
+
+        if key in processed_prices:
+            return processed_prices[key]
+
+        return process_prices(
+            request=self.context['request'],
+            prices={key: price}
+        )[key]
+
+
 class CartItemElementSerializer(serializers.ModelSerializer):
     element = ContentTypeSerializerField(
         natural_keys=settings.ELEMENT_ALLOWED_TYPES,
@@ -32,6 +107,7 @@ class CartItemElementSerializer(serializers.ModelSerializer):
             'parameters',
             'quantity'
         ]
+        list_serializer_class = CartItemElementListSerializer
 
 
 class CartChangeSerializer(serializers.ModelSerializer):
@@ -44,7 +120,10 @@ class CartChangeSerializer(serializers.ModelSerializer):
         ]
 
 
-class CartItemRetrieveSerializer(serializers.ModelSerializer):
+class CartItemRetrieveSerializer(
+    PriceProcessingMixin,
+    serializers.ModelSerializer
+):
     element = CartItemElementRelatedField(
         read_only=True,
         source='content_object'
@@ -63,15 +142,26 @@ class CartItemRetrieveSerializer(serializers.ModelSerializer):
         ]
 
     def get_price(self, cart_item: 'CartItem'):
-        price = cart_item.price
+        return self.process_price(cart_item, cart_item.price)
 
-        return settings.PRICE_PROCESSOR(
-            request=self.context['request'],
-            price=price
-        )
 
+class CartGroupRetrieveListSerializer(serializers.ListSerializer):
+    """
+    Renders elements of all groups with one serializer per type
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if hasattr(data, 'all') else data
+        cart_groups = list(iterable)
+        self.child.render_elements(cart_groups)
 
-class CartGroupRetrieveSerializer(serializers.ModelSerializer):
+        return super().to_representation(cart_groups)
+
+
+class CartGroupRetrieveSerializer(
+    PriceProcessingMixin,
+    serializers.ModelSerializer
+):
     price = serializers.SerializerMethodField()
     base = CartItemRetrieveSerializer()
     relations = CartItemRetrieveSerializer(many=True)
@@ -82,21 +172,48 @@ class CartGroupRetrieveSerializer(serializers.ModelSerializer):
         fields = [
             'id',
             'price',
+            'quantity',
             'base',
             'relations',
             'parameters'
         ]
+        list_serializer_class = CartGroupRetrieveListSerializer
 
-    def get_price(self, cart_group: 'CartGroup'):
-        price = cart_group.price
+    def to_representation(self, instance):
+        if self.parent is None:
+            self.render_elements([instance])
 
-        return settings.PRICE_PROCESSOR(
-            request=self.context['request'],
-            price=price
+        return super().to_representation(instance)
+
+    def render_elements(self, cart_groups) -> None:
+        """
+        Render elements of base and related items of given groups
+        in advance, see `CartItemElementRelatedField`
+        """
+        key = CartItemElementRelatedField.rendered_elements_context_key
+        rendered_elements = self.context.setdefault(key, {})
+        rendered_elements.update(
+            render_elements(
+                elements=[
+                    cart_item.content_object
+                    for cart_group in cart_groups
+                    for cart_item in (
+                        cart_group.base,
+                        *cart_group.relations.all()
+                    )
+                ],
+                serializer_context=self.context
+            )
         )
 
+    def get_price(self, cart_group: 'CartGroup'):
+        return self.process_price(cart_group, cart_group.price)
+
 
-class CartRetrieveSerializer(serializers.ModelSerializer):
+class CartRetrieveSerializer(
+    PriceProcessingMixin,
+    serializers.ModelSerializer
+):
     groups = CartGroupRetrieveSerializer(many=True)
     total_price = serializers.SerializerMethodField()
     parameters = JSONStringField()
@@ -110,16 +227,43 @@ class CartRetrieveSerializer(serializers.ModelSerializer):
             'parameters',
         ]
 
-    def get_total_price(self, cart: 'Cart'):
-        price = cart.total_price
+    def to_representation(self, instance):
+        if settings.BATCH_PRICE_PROCESSOR is not None:
+            self.context.setdefault(
+                self.processed_prices_context_key,
+                {}
+            ).update(
+                process_prices(
+                    request=self.context['request'],
+                    prices=self.get_prices(instance)
+                )
+            )
 
-        return settings.PRICE_PROCESSOR(
-            request=self.context['request'],
-            price=price
-        )
+        return super().to_representation(instance)
+
+    def get_prices(self, cart: 'Cart') -> Dict:
+        """
+        Collect all prices of the cart to process them at once
+        """
+        prices = {(type(cart), cart.pk): cart.total_price}
+
+        for cart_group in cart.groups.all():
+            cart_items = [cart_group.base, *cart_group.relations.all()]
+            prices[(type(cart_group), cart_group.pk)] = cart_group.price
+
+            for cart_item in cart_items:
+                prices[(type(cart_item), cart_item.pk)] = cart_item.price
+
+        return prices
+
+    def get_total_price(self, cart: 'Cart'):
+        return self.process_price(cart, cart.total_price)
 
 
-class CartQuantityRetrieveSerializer(serializers.ModelSerializer):
+class CartQuantityRetrieveSerializer(
+    PriceProcessingMixin,
+    serializers.ModelSerializer
+):
     total_price = serializers.SerializerMethodField()
 
     class Meta:
@@ -130,9 +274,4 @@ class CartQuantityRetrieveSerializer(serializers.ModelSerializer):
         ]
 
     def get_total_price(self, cart: 'Cart'):
-        price = cart.total_price
-
-        return settings.PRICE_PROCESSOR(
-            request=self.context['request'],
-            price=price
-        )
+        return self.process_price(cart, cart.total_price)
@@ -1,35 +1,136 @@
-from typing import Dict, TYPE_CHECKING, Type
+from collections import defaultdict
+from decimal import Decimal
+from functools import lru_cache
+from typing import (
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Type,
+    Union
+)
 
 from django.apps import apps
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.http import parse_etags, quote_etag
 from django.utils.translation import ugettext_lazy as _
 
 from ..settings import settings
 
 if TYPE_CHECKING:
     from django.db.models import Model
+    from rest_framework.serializers import Serializer
+    from ..entities import CartPriceInfo
+    from ..models import Cart
 
 __all__ = (
+    'get_element_representation_serializers',
+    'get_element_representation_serializer_class',
+    'clear_element_representation_serializers',
     'cart_element_representation_serializer',
-    'get_base_api_view'
+    'render_elements',
+    'get_base_api_view',
+    'get_cart_etag',
+    'etag_matches',
+    'get_price_processor_memo',
+    'process_prices',
 )
 
 
+@lru_cache(maxsize=None)
+def get_element_representation_serializers(
+) -> Dict[Type['Model'], Type['Serializer']]:
+    """
+    Returns `ELEMENT_REPRESENTATION_SERIALIZERS` keyed by model classes
+    """
+    return {
+        apps.get_model(model_path): serializer_class
+        for model_path, serializer_class in (
+            settings.ELEMENT_REPRESENTATION_SERIALIZERS.items()
+        )
+    }
+
+
+@lru_cache(maxsize=None)
+def get_element_representation_serializer_class(
+        model_class: Type['Model']
+) -> Optional[Type['Serializer']]:
+    """
+    Returns representation serializer of a model class
+    or of its nearest parent
+    """
+    serializers = get_element_representation_serializers()
+
+    for parent_class in model_class.__mro__:
+        if parent_class in serializers:
+            return serializers[parent_class]
+
+    return None
+
+
+@receiver(setting_changed)
+def clear_element_representation_serializers(**kwargs):
+    get_element_representation_serializers.cache_clear()
+    get_element_representation_serializer_class.cache_clear()
+
+
 def cart_element_representation_serializer(
-        value: Type['Model'],
+        value: 'Model',
         serializer_context: Dict
 ):
-    serializers = settings.ELEMENT_REPRESENTATION_SERIALIZERS
+    serializer_class = get_element_representation_serializer_class(
+        type(value)
+    )
+
+    if serializer_class is None:
+        raise Exception(_('Unexpected type of cart element'))
+
+    return serializer_class(
+        instance=value,
+        context=serializer_context
+    )
+
+
+def render_elements(
+        *,
+        elements: Iterable['Model'],
+        serializer_context: Dict
+) -> Dict[Tuple[Type['Model'], Hashable], Dict]:
+    """
+    Represents given elements with one `many=True` serializer per type
+
+    Result is keyed by `(model class, pk)`.
+    """
+    elements_by_type = defaultdict(dict)
+
+    for element in elements:
+        if element is not None:
+            elements_by_type[type(element)][element.pk] = element
+
+    rendered = {}
+
+    for model_class, elements_by_pk in elements_by_type.items():
+        serializer_class = get_element_representation_serializer_class(
+            model_class
+        )
+
+        if serializer_class is None:
+            raise Exception(_('Unexpected type of cart element'))
 
-    for model_path, serializer_class in serializers.items():
-        model_class = apps.get_model(model_path)
+        data = serializer_class(
+            instance=list(elements_by_pk.values()),
+            context=serializer_context,
+            many=True
+        ).data
 
-        if isinstance(value, model_class):
-            return serializer_class(
-                instance=value,
-                context=serializer_context
-            )
+        for pk, element_data in zip(elements_by_pk, data):
+            rendered[(model_class, pk)] = element_data
 
-    raise Exception(_('Unexpected type of cart element'))
+    return rendered
 
 
 def get_base_api_view():
@@ -43,3 +144,77 @@ def get_base_api_view():
             pass
 
     return BaseAPIView
+
+
+def get_cart_etag(
+        *,
+        cart: Optional[Union['Cart', 'CartPriceInfo']]
+) -> Optional[str]:
+    """
+    Returns ETag, based on cart's version
+    """
+    if cart is None or cart.uuid is None or cart.version is None:
+        return None
+
+    return quote_etag(f'{cart.uuid}:{cart.version}')
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """
+    Weak comparison of ETag with `If-None-Match` header value
+    """
+    etags = parse_etags(if_none_match)
+
+    if '*' in etags:
+        return True
+
+    return any(
+        value.replace('W/', '', 1) == etag
+        for value in etags
+    )
+
+
+def get_price_processor_memo(request) -> Dict:
+    """
+    Returns dict, shared by batch price processor calls
+    during the request
+    """
+    if request is None:
+        return {}
+
+    # DRF request proxies attributes of Django's request
+    request = getattr(request, '_request', request)
+    memo = getattr(request, '_cart_price_processor_memo', None)
+
+    if memo is None:
+        memo = {}
+        request._cart_price_processor_memo = memo
+
+    return memo
+
+
+def process_prices(
+        *,
+        request,
+        prices: Dict[Hashable, 'Decimal']
+) -> Dict[Hashable, 'Decimal']:
+    """
+    Process given prices with `CART_BATCH_PRICE_PROCESSOR` in one call
+    or with `CART_PRICE_PROCESSOR` one by one
+    """
+    batch_processor = settings.BATCH_PRICE_PROCESSOR
+
+    if batch_processor is None:
+        return {
+            key: settings.PRICE_PROCESSOR(request=request, price=price)
+            for key, price in prices.items()
+        }
+
+    keys: List[Hashable] = list(prices)
+    processed_prices = batch_processor(
+        request=request,
+        prices=[prices[key] for key in keys],
+        memo=get_price_processor_memo(request)
+    )
+
+    return dict(zip(keys, processed_prices))
@@ -1,31 +1,54 @@
+from typing import Optional, TYPE_CHECKING, Union
+
+from django.db import transaction
 from rest_framework import status
 from rest_framework.generics import GenericAPIView, RetrieveAPIView
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .representation import (
+    get_cart_representation,
+    get_cart_representation_queryset
+)
 from .serializers import (
     CartChangeSerializer,
     CartRetrieveSerializer,
     CartQuantityRetrieveSerializer
 )
-from .utils import get_base_api_view
+from .utils import etag_matches, get_base_api_view, get_cart_etag
+from ..consts import CART_RENDER_MODE_VALUES
+from ..entities import CartAddEntry, CartItemEntity
+from ..instrumentation import (
+    finish_phase_timer,
+    instrument,
+    phase,
+    start_phase_timer
+)
 from ..models import Cart
 from ..pipelines import (
+    run_add_batch_pipelines,
     run_add_pipelines,
     run_post_add_pipelines
 )
 from ..selectors import (
     get_cart_from_request,
+    get_cart_quantity_and_total_price,
 )
 from ..services import (
-    add_item_to_cart,
+    add_items_to_cart,
+    apply_cart_items_prices,
     clear_cart,
     update_cart_quantity_and_total_price,
 )
 from ..settings import settings
 
+if TYPE_CHECKING:
+    from ..entities import CartPriceInfo
+
 __all__ = (
+    'InstrumentedAPIViewMixin',
+    'CartETagMixin',
     'CartChangeAPIView',
     'CartClearAPIView',
     'CartRetrieveAPIView',
@@ -33,78 +56,148 @@ __all__ = (
 )
 
 
-class CartChangeAPIView(get_base_api_view(), GenericAPIView):
+class InstrumentedAPIViewMixin:
+    """
+    Records queries and timings of every request
+    as `views.<view class name>` operation
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with instrument(f'views.{type(self).__name__}'):
+            return super().dispatch(request, *args, **kwargs)
+
+
+class CartChangeAPIView(
+    InstrumentedAPIViewMixin,
+    get_base_api_view(),
+    GenericAPIView
+):
     permission_classes = (AllowAny, )
     queryset = Cart.objects.open().optimized()
     serializer_class = CartChangeSerializer
 
     def perform_action(self, serializer) -> 'Cart':
-        entities = serializer.validated_data['entities']
+        entities = [
+            CartItemEntity(
+                content_type=entity['element']['type'],
+                object_id=entity['element']['id'],
+                content_object=entity['element']['content_object'],
+                quantity=entity['quantity'],
+                parameters=entity.get('parameters'),
+            )
+            for entity in serializer.validated_data['entities']
+        ]
         cart_queryset = self.get_queryset()
-        cart = settings.GETTER(
-            request=self.request,
-            cart_queryset=cart_queryset,
-        )
+
+        with phase(self.request, 'getter'):
+            cart = settings.GETTER(
+                request=self.request,
+                cart_queryset=cart_queryset,
+            )
+
         user = self.request.user
 
-        for entity in entities:
-            content_object = entity['element']['content_object']
-            cart_item, cart_group = add_item_to_cart(
+        with phase(self.request, 'add_items'):
+            results = add_items_to_cart(
                 cart=cart,
                 user=user,
-                content_type=entity['element']['type'],
-                object_id=entity['element']['id'],
-                content_object=content_object,
-                quantity=entity['quantity'],
-                parameters=entity.get('parameters', {}),
+                entities=entities
             )
+
+        for entity, cart_item, cart_group in results:
             run_add_pipelines(
                 cart=cart,
                 user=user,
-                content_object=content_object,
+                content_object=entity.content_object,
                 cart_item=cart_item,
                 cart_group=cart_group,
-                quantity=entity['quantity'],
-                parameters=entity.get('parameters'),
+                quantity=entity.quantity,
+                parameters=entity.parameters,
                 request=self.request
             )
 
+        run_add_batch_pipelines(
+            cart=cart,
+            user=user,
+            entries=[
+                CartAddEntry(
+                    cart_item=cart_item,
+                    cart_group=cart_group,
+                    content_object=entity.content_object,
+                    quantity=entity.quantity,
+                    parameters=entity.parameters,
+                )
+                for entity, cart_item, cart_group in results
+            ],
+            request=self.request
+        )
+
         run_post_add_pipelines(
             cart=cart,
             user=user,
             request=self.request
         )
 
-        cart = cart_queryset.get(pk=cart.pk)
+        with phase(self.request, 'prices'):
+            changed_items = apply_cart_items_prices(
+                cart=cart,
+                user=user,
+                request=self.request
+            )
+
+        with phase(self.request, 'refetch'):
+            cart = (
+                get_cart_representation_queryset(cart_queryset)
+                .get(pk=cart.pk)
+            )
 
-        update_cart_quantity_and_total_price(cart=cart)
+        if not settings.INCREMENTAL_TOTALS or changed_items:
+            with phase(self.request, 'totals'):
+                update_cart_quantity_and_total_price(cart=cart)
 
         return cart
 
     def post(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        start_phase_timer(request)
 
-        cart = self.perform_action(serializer)
+        with phase(request, 'validation'):
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
 
-        response_serializer = CartRetrieveSerializer(
-            instance=cart,
-            context=self.get_serializer_context()
-        )
+        # cart stays locked by `add_items_to_cart` until totals are updated
+        with transaction.atomic():
+            cart = self.perform_action(serializer)
 
-        data = settings.VIEW_RESPONSE_MODIFIER(
-            request=request,
-            cart=cart,
-            serializer=response_serializer
-        )
+        with phase(request, 'serialization'):
+            response_serializer = get_cart_representation(
+                cart=cart,
+                context=self.get_serializer_context()
+            )
 
-        return Response(
+            data = settings.VIEW_RESPONSE_MODIFIER(
+                request=request,
+                cart=cart,
+                serializer=response_serializer
+            )
+
+        response = Response(
             data=data,
             status=status.HTTP_200_OK
         )
+        finish_phase_timer(
+            request=request,
+            response=response,
+            name=type(self).__name__
+        )
+
+        return response
 
 
-class CartClearAPIView(get_base_api_view(), APIView):
+class CartClearAPIView(
+    InstrumentedAPIViewMixin,
+    get_base_api_view(),
+    APIView
+):
     permission_classes = (AllowAny,)
 
     def post(self, request, *args, **kwargs):
@@ -121,10 +214,58 @@ class CartClearAPIView(get_base_api_view(), APIView):
         return Response()
 
 
-class CartRetrieveAPIView(get_base_api_view(), RetrieveAPIView):
+class CartETagMixin:
+    """
+    Sets cart's version as `ETag` header and answers requests
+    with a matching `If-None-Match` header with 304 status
+    after a single lookup of the version
+    """
+    version_queryset = Cart.objects.open().only('version')
+
+    def get_cart_version(self) -> Optional[Union['Cart', 'CartPriceInfo']]:
+        return get_cart_from_request(
+            request=self.request,
+            cart_queryset=self.version_queryset,
+            auto_create=False
+        )
+
+    def get_not_modified_response(self) -> Optional['Response']:
+        if_none_match = self.request.META.get('HTTP_IF_NONE_MATCH')
+
+        if not if_none_match:
+            return None
+
+        etag = get_cart_etag(cart=self.get_cart_version())
+
+        if etag and etag_matches(etag, if_none_match):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers={'ETag': etag}
+            )
+
+        return None
+
+    def set_etag(self, response: 'Response', cart) -> 'Response':
+        etag = get_cart_etag(cart=cart)
+
+        if etag:
+            response['ETag'] = etag
+
+        return response
+
+
+class CartRetrieveAPIView(
+    InstrumentedAPIViewMixin,
+    CartETagMixin,
+    get_base_api_view(),
+    RetrieveAPIView
+):
     permission_classes = (AllowAny,)
     serializer_class = CartRetrieveSerializer
-    queryset = Cart.objects.open().optimized()
+    queryset = Cart.objects.open()
+
+    def get_queryset(self):
+        return get_cart_representation_queryset(super().get_queryset())
 
     def get_object(self):
         return get_cart_from_request(
@@ -134,24 +275,65 @@ class CartRetrieveAPIView(get_base_api_view(), RetrieveAPIView):
         )
 
     def retrieve(self, request, *args, **kwargs):
+        not_modified_response = self.get_not_modified_response()
+
+        if not_modified_response:
+            return not_modified_response
+
         instance = self.get_object()
-        serializer = self.get_serializer(instance)
+
+        # view's serializer is used unless cart is represented by values
+        if settings.RENDER_MODE == CART_RENDER_MODE_VALUES:
+            serializer = get_cart_representation(
+                cart=instance,
+                context=self.get_serializer_context()
+            )
+        else:
+            serializer = self.get_serializer(instance)
+
         data = settings.VIEW_RESPONSE_MODIFIER(
             request=request,
             cart=instance,
             serializer=serializer
         )
-        return Response(data)
+        return self.set_etag(Response(data), cart=instance)
 
 
-class CartQuantityRetrieveAPIView(get_base_api_view(), RetrieveAPIView):
+class CartQuantityRetrieveAPIView(
+    InstrumentedAPIViewMixin,
+    CartETagMixin,
+    get_base_api_view(),
+    RetrieveAPIView
+):
     permission_classes = (AllowAny,)
     serializer_class = CartQuantityRetrieveSerializer
-    queryset = Cart.objects.open().only('quantity', 'total_price')
+    queryset = (
+        Cart.objects.open()
+        .only('quantity', 'total_price', 'version')
+    )
+
+    def get_cart_version(self):
+        if settings.CACHE_ENABLED:
+            return get_cart_quantity_and_total_price(request=self.request)
+
+        return super().get_cart_version()
 
     def get_object(self):
+        if settings.CACHE_ENABLED:
+            return get_cart_quantity_and_total_price(request=self.request)
+
         return get_cart_from_request(
             request=self.request,
             cart_queryset=self.get_queryset(),
             auto_create=False
         )
+
+    def retrieve(self, request, *args, **kwargs):
+        not_modified_response = self.get_not_modified_response()
+
+        if not_modified_response:
+            return not_modified_response
+
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        return self.set_etag(Response(serializer.data), cart=instance)
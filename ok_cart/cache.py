@@ -0,0 +1,116 @@
+from time import time
+from typing import List, Optional, TYPE_CHECKING
+
+from django.core.cache import caches
+from django.db import transaction
+
+from .settings import settings
+
+if TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+    from django.http.request import HttpRequest
+    from .models import Cart
+
+__all__ = (
+    'get_cart_cache',
+    'get_request_cache_owner',
+    'get_cart_cache_owners',
+    'get_cart_price_info_cache_key',
+    'invalidate_cart_cache',
+)
+
+CACHE_KEY_PREFIX = 'ok_cart'
+
+
+def get_cart_cache() -> 'BaseCache':
+    return caches[settings.CACHE_ALIAS]
+
+
+def get_request_cache_owner(*, request: 'HttpRequest') -> Optional[str]:
+    """
+    Return cache owner of request's cart: user or session
+    """
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+
+    if request.session.session_key:
+        return f'session:{request.session.session_key}'
+
+    return None
+
+
+def get_cart_cache_owners(*, cart: 'Cart') -> List[str]:
+    """
+    Return all cache owners, which can resolve given cart
+    """
+    owners = []
+
+    if cart.user_id:
+        owners.append(f'user:{cart.user_id}')
+
+    if cart.session_key:
+        owners.append(f'session:{cart.session_key}')
+
+    return owners
+
+
+def get_version_key(owner: str) -> str:
+    return f'{CACHE_KEY_PREFIX}:version:{owner}'
+
+
+def get_owner_version(cache: 'BaseCache', owner: str) -> int:
+    version_key = get_version_key(owner)
+    version = cache.get(version_key)
+
+    if version is None:
+        # start from a unique version, so entries, cached before
+        # the version key was evicted, can't be hit again
+        version = int(time() * 1000)
+        cache.set(version_key, version, timeout=None)
+
+    return version
+
+
+def get_cart_price_info_cache_key(
+        *,
+        request: 'HttpRequest'
+) -> Optional[str]:
+    """
+    Return versioned cache key of request's cart quantity and total price.
+    Key must be resolved before reading the cart from the database,
+    so a concurrent change can't be cached under a newer version.
+    """
+    owner = get_request_cache_owner(request=request)
+
+    if owner is None:
+        return None
+
+    version = get_owner_version(get_cart_cache(), owner)
+
+    return f'{CACHE_KEY_PREFIX}:price_info:{owner}:{version}'
+
+
+def invalidate_cart_cache(*, cart: 'Cart') -> None:
+    """
+    Bump cache version of all cart's owners after transaction's commit
+    """
+    if not settings.CACHE_ENABLED:
+        return
+
+    owners = get_cart_cache_owners(cart=cart)
+
+    def bump_versions():
+        cache = get_cart_cache()
+
+        for owner in owners:
+            try:
+                cache.incr(get_version_key(owner))
+            except ValueError:
+                cache.set(
+                    get_version_key(owner),
+                    int(time() * 1000),
+                    timeout=None
+                )
+
+    # readers must not cache old data under the new version
+    transaction.on_commit(bump_versions)
@@ -4,6 +4,9 @@ __all__ = (
     'CART_STATUS_OPENED',
     'CART_STATUS_CLOSED',
     'CART_STATUS_CHOICES',
+    'CART_SESSION_KEY',
+    'CART_RENDER_MODE_SERIALIZER',
+    'CART_RENDER_MODE_VALUES',
 )
 
 CART_STATUS_OPENED = 'opened'
@@ -14,3 +17,10 @@ CART_STATUS_CHOICES = (
     (CART_STATUS_OPENED, pgettext_lazy("Cart", "Open")),
     (CART_STATUS_CLOSED, pgettext_lazy("Cart", "Closed"))
 )
+
+# session key to store resolved cart's uuid
+CART_SESSION_KEY = '_ok_cart_uuid'
+
+# carts representation modes
+CART_RENDER_MODE_SERIALIZER = 'serializer'
+CART_RENDER_MODE_VALUES = 'values'
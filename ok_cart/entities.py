@@ -1,7 +1,19 @@
 from dataclasses import dataclass
+from typing import Dict, Optional, TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from django.contrib.contenttypes.models import ContentType
+    from django.db.models import Model
+
+    from .models import CartGroup, CartItem
 
 __all__ = (
     'CartPriceInfo',
+    'CartItemEntity',
+    'CartAddEntry',
+    'OperationMetrics',
 )
 
 
@@ -9,3 +21,45 @@ __all__ = (
 class CartPriceInfo:
     total_price: float
     quantity: int
+    uuid: Optional['UUID'] = None
+    version: Optional[int] = None
+
+
+@dataclass
+class CartItemEntity:
+    """
+    Object to add to the cart with the requested quantity and parameters
+    """
+    content_type: 'ContentType'
+    object_id: Union[int, str]
+    content_object: 'Model' = None
+    quantity: int = 1
+    parameters: Dict = None
+
+    @property
+    def key(self):
+        return self.content_type.pk, str(self.object_id)
+
+
+@dataclass
+class CartAddEntry:
+    """
+    Result of adding an object to the cart, passed to batch pipelines
+    """
+    cart_item: 'CartItem'
+    cart_group: Optional['CartGroup']
+    content_object: 'Model'
+    quantity: int
+    parameters: Dict = None
+
+
+@dataclass
+class OperationMetrics:
+    """
+    Queries and timings of a single call of cart operation,
+    durations are in seconds
+    """
+    name: str
+    queries: int = 0
+    sql_time: float = 0
+    duration: float = 0
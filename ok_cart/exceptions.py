@@ -2,8 +2,17 @@ from django.core.exceptions import ValidationError
 
 __all__ = (
     'CartException',
+    'QueryBudgetExceeded',
 )
 
 
 class CartException(ValidationError):
     pass
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Cart operation made more queries, than allowed
+    with `CART_QUERY_BUDGETS` setting
+    """
+    pass
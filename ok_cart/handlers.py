@@ -1,12 +1,18 @@
 from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db.models.signals import m2m_changed, post_save
 from django.dispatch import receiver
 
+from .cache import invalidate_cart_cache
+from .models import CartGroup, CartItem
 from .selectors import get_or_create_anonymous_cart, get_or_create_user_cart
 from .services import merge
+from .services.cart_item import detach_cart_items
 from .settings import settings
 
 __all__ = (
     'user_logged_in_handler',
+    'cart_group_post_save_handler',
+    'cart_group_relations_changed_handler',
 )
 
 
@@ -33,3 +39,90 @@ def user_logged_in_handler(request, user, **kwargs):
             else:
                 anonymous_cart.user = user
                 anonymous_cart.save(update_fields=["user"])
+                invalidate_cart_cache(cart=anonymous_cart)
+
+
+@receiver(post_save, sender=CartGroup)
+def cart_group_post_save_handler(instance: 'CartGroup', **kwargs):
+    """
+    Keep cart of group's base item in sync with the group
+    """
+    base_field = CartGroup._meta.get_field('base')
+
+    if (
+            base_field.is_cached(instance)
+            and instance.base.cart_id == instance.cart_id
+    ):
+        return
+
+    (
+        CartItem.objects
+        .filter(pk=instance.base_id)
+        .exclude(cart_id=instance.cart_id)
+        .update(cart_id=instance.cart_id)
+    )
+
+
+@receiver(m2m_changed, sender=CartGroup.relations.through)
+def cart_group_relations_changed_handler(
+        instance,
+        action: str,
+        reverse: bool,
+        pk_set,
+        **kwargs
+):
+    """
+    Set cart of items, added to groups' relations,
+    and unset it for items, removed from all groups
+    """
+    if action == 'pre_clear':
+        # cleared items are unknown after clearing
+        if not reverse:
+            instance._ok_cart_cleared_relations = list(
+                instance.relations.values_list('pk', flat=True)
+            )
+        return
+
+    if action in ('post_remove', 'post_clear'):
+        if reverse:
+            cart_item_pks = [instance.pk]
+        elif action == 'post_clear':
+            cart_item_pks = instance.__dict__.pop(
+                '_ok_cart_cleared_relations',
+                []
+            )
+        else:
+            cart_item_pks = pk_set or []
+
+        detach_cart_items(cart_item_pks=cart_item_pks)
+
+        if reverse:
+            instance.cart_id = (
+                CartItem.objects
+                .filter(pk=instance.pk)
+                .values_list('cart_id', flat=True)
+                .first()
+            )
+        return
+
+    if action != 'post_add' or not pk_set:
+        return
+
+    if reverse:
+        # items' groups are changed
+        cart_group = CartGroup.objects.filter(pk__in=pk_set).first()
+
+        if cart_group:
+            (
+                CartItem.objects
+                .filter(pk=instance.pk)
+                .update(cart_id=cart_group.cart_id)
+            )
+            instance.cart_id = cart_group.cart_id
+    else:
+        (
+            CartItem.objects
+            .filter(pk__in=pk_set)
+            .exclude(cart_id=instance.cart_id)
+            .update(cart_id=instance.cart_id)
+        )
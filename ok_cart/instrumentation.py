@@ -0,0 +1,257 @@
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    Optional,
+    TYPE_CHECKING
+)
+
+from django.db import connection
+
+from .entities import OperationMetrics
+from .exceptions import QueryBudgetExceeded
+from .settings import settings
+
+if TYPE_CHECKING:
+    from django.http.request import HttpRequest
+    from django.http.response import HttpResponse
+
+__all__ = (
+    'DEFAULT_QUERY_BUDGETS',
+    'QueryRecorder',
+    'get_operation_name',
+    'get_query_budget',
+    'instrument',
+    'instrumented',
+    'PhaseTimer',
+    'get_phase_timer',
+    'start_phase_timer',
+    'finish_phase_timer',
+    'phase',
+    'get_pipeline_phase_name',
+)
+
+logger = logging.getLogger('ok_cart')
+
+# queries of API views don't depend on the number of items in the cart
+DEFAULT_QUERY_BUDGETS = {
+    'views.CartChangeAPIView': 40,
+    'views.CartClearAPIView': 20,
+    'views.CartRetrieveAPIView': 10,
+    'views.CartQuantityRetrieveAPIView': 5,
+}
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper, which counts queries and their time
+    """
+
+    def __init__(self, metrics: 'OperationMetrics'):
+        self.metrics = metrics
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.metrics.queries += 1
+            self.metrics.sql_time += time.perf_counter() - start
+
+
+def get_operation_name(func: Callable) -> str:
+    """
+    Return operation name like `services.add_items_to_cart`
+    for cart's functions or full path for others
+    """
+    module = func.__module__
+
+    if module.startswith('ok_cart.'):
+        module = module.split('.')[1]
+
+    return f'{module}.{func.__name__}'
+
+
+def get_query_budget(name: str) -> Optional[int]:
+    """
+    Return allowed number of queries for given operation,
+    `None` budget in `CART_QUERY_BUDGETS` disables the default one
+    """
+    return settings.QUERY_BUDGETS.get(
+        name,
+        DEFAULT_QUERY_BUDGETS.get(name)
+    )
+
+
+@contextmanager
+def instrument(name: str) -> Iterator[Optional['OperationMetrics']]:
+    """
+    Record queries, SQL time and wall time of the wrapped block,
+    publish them with `CART_METRICS_HOOK` and check operation's budget
+
+    Nothing is recorded for operations without a hook and a budget.
+    """
+    budget = get_query_budget(name)
+    hook = settings.METRICS_HOOK
+
+    if budget is None and hook is None:
+        yield None
+        return
+
+    metrics = OperationMetrics(name=name)
+    start = time.perf_counter()
+
+    with connection.execute_wrapper(QueryRecorder(metrics)):
+        yield metrics
+
+    metrics.duration = time.perf_counter() - start
+
+    if hook is not None:
+        hook(metrics=metrics)
+
+    if budget is not None and metrics.queries > budget:
+        message = (
+            f'{name} made {metrics.queries} queries, '
+            f'budget is {budget}'
+        )
+
+        if settings.QUERY_BUDGETS_RAISE:
+            raise QueryBudgetExceeded(message)
+
+        logger.warning(message)
+
+
+def instrumented(func: Callable) -> Callable:
+    """
+    Wrap every call of given function with `instrument`
+    """
+    name = get_operation_name(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with instrument(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class PhaseTimer:
+    """
+    Collects durations of request's phases in seconds,
+    durations of phases with the same name are summed up
+    """
+    # request's attribute to store timer in
+    request_attribute = '_ok_cart_phase_timer'
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.durations[name] = (
+                self.durations.get(name, 0)
+                + time.perf_counter()
+                - start
+            )
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.start
+
+    def get_server_timing(self) -> str:
+        """
+        Return `Server-Timing` header value with durations in milliseconds
+        """
+        return ', '.join(
+            f'{name};dur={duration * 1000:.1f}'
+            for name, duration in (
+                *self.durations.items(),
+                ('total', self.total),
+            )
+        )
+
+
+def get_phase_timer(
+        request: Optional['HttpRequest']
+) -> Optional['PhaseTimer']:
+    """
+    Return timer, started for given Django or DRF request
+    """
+    request = getattr(request, '_request', request)
+
+    return getattr(request, PhaseTimer.request_attribute, None)
+
+
+def start_phase_timer(request: 'HttpRequest') -> Optional['PhaseTimer']:
+    """
+    Start timing of request's phases with `CART_SERVER_TIMING`
+    or `CART_SLOW_LOG_THRESHOLD` setting
+    """
+    if (
+            not settings.SERVER_TIMING
+            and settings.SLOW_LOG_THRESHOLD is None
+    ):
+        return None
+
+    timer = PhaseTimer()
+    setattr(
+        getattr(request, '_request', request),
+        PhaseTimer.request_attribute,
+        timer
+    )
+
+    return timer
+
+
+def finish_phase_timer(
+        *,
+        request: 'HttpRequest',
+        response: 'HttpResponse',
+        name: str
+) -> None:
+    """
+    Set `Server-Timing` header and log requests,
+    slower than `CART_SLOW_LOG_THRESHOLD` milliseconds
+    """
+    timer = get_phase_timer(request)
+
+    if timer is None:
+        return
+
+    server_timing = timer.get_server_timing()
+
+    if settings.SERVER_TIMING:
+        response['Server-Timing'] = server_timing
+
+    threshold = settings.SLOW_LOG_THRESHOLD
+
+    if threshold is not None and timer.total * 1000 > threshold:
+        logger.warning(f'Slow {name}: {server_timing}')
+
+
+def phase(request: Optional['HttpRequest'], name: str) -> ContextManager:
+    """
+    Time a phase of given request, if its timer is started
+    """
+    timer = get_phase_timer(request)
+
+    if timer is None:
+        return nullcontext()
+
+    return timer.phase(name)
+
+
+def get_pipeline_phase_name(prefix: str, func: Callable) -> str:
+    return f'{prefix}.{getattr(func, "__name__", type(func).__name__)}'
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from ...services import archive_closed_carts
+
+
+class Command(BaseCommand):
+    help = 'Move closed carts with their groups and items to archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=0,
+            help='Archive carts not changed for this number of days.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of carts archived per query.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Seconds to sleep between batches.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count carts to archive.',
+        )
+
+    def handle(self, *args, **options):
+        count = archive_closed_carts(
+            closed_before=now() - timedelta(days=options['days']),
+            batch_size=options['batch_size'],
+            sleep=options['sleep'],
+            dry_run=options['dry_run'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'{count} cart(s) to archive.')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{count} cart(s) archived.'))
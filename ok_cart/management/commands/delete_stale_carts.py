@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from ...services import delete_stale_carts
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete anonymous, empty and closed carts, '
+        'which were not changed for given number of days'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Delete carts not changed for this number of days.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of carts deleted per query.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Seconds to sleep between batches.',
+        )
+        parser.add_argument(
+            '--skip-anonymous',
+            action='store_true',
+            help='Keep anonymous carts.',
+        )
+        parser.add_argument(
+            '--skip-empty',
+            action='store_true',
+            help='Keep empty carts.',
+        )
+        parser.add_argument(
+            '--skip-closed',
+            action='store_true',
+            help='Keep closed carts.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count carts to delete.',
+        )
+
+    def handle(self, *args, **options):
+        count = delete_stale_carts(
+            cutoff=now() - timedelta(days=options['days']),
+            anonymous=not options['skip_anonymous'],
+            empty=not options['skip_empty'],
+            closed=not options['skip_closed'],
+            batch_size=options['batch_size'],
+            sleep=options['sleep'],
+            dry_run=options['dry_run'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'{count} cart(s) to delete.')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{count} cart(s) deleted.'))
@@ -0,0 +1,49 @@
+# Generated by Django 3.2.25 on 2026-10-17 18:16
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_cart_groups_quantity(apps, schema_editor):
+    CartGroup = apps.get_model('ok_cart', 'CartGroup')
+    CartItem = apps.get_model('ok_cart', 'CartItem')
+
+    base_quantity = (
+        CartItem.objects
+        .filter(pk=OuterRef('base_id'))
+        .values('quantity')
+    )
+    relations_quantity = (
+        CartGroup.relations.through.objects
+        .filter(cartgroup_id=OuterRef('pk'))
+        .order_by()
+        .values('cartgroup_id')
+        .annotate(quantity=Sum('cartitem__quantity'))
+        .values('quantity')
+    )
+    CartGroup.objects.update(
+        quantity=(
+            Coalesce(Subquery(base_quantity), 0)
+            + Coalesce(Subquery(relations_quantity), 0)
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ok_cart', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cartgroup',
+            name='quantity',
+            field=models.PositiveIntegerField(default=0, verbose_name='Quantity'),
+        ),
+        migrations.RunPython(
+            fill_cart_groups_quantity,
+            migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-17 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ok_cart', '0002_cartgroup_quantity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cart',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Increments on every change of the cart.', verbose_name='Version'),
+        ),
+    ]
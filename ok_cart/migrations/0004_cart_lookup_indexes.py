@@ -0,0 +1,102 @@
+# Generated by Django 3.2.25 on 2026-10-17 19:20
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+CART_STATUS_OPENED = 'opened'
+
+
+def delete_duplicated_open_carts(apps, schema_editor):
+    """
+    Keep only the latest opened cart per user and per anonymous session,
+    older ones are abandoned and deleted with their groups and items
+
+    Closing them would make them look like checked out orders.
+    """
+    Cart = apps.get_model('ok_cart', 'Cart')
+    CartItem = apps.get_model('ok_cart', 'CartItem')
+    opened_carts = Cart.objects.filter(status=CART_STATUS_OPENED)
+    owners = (
+        ('user', opened_carts.filter(user__isnull=False)),
+        (
+            'session_key',
+            opened_carts.filter(user__isnull=True).exclude(session_key='')
+        ),
+    )
+
+    duplicated_carts_pks = []
+
+    for field, carts in owners:
+        duplicated_values = (
+            carts
+            .order_by()
+            .values(field)
+            .annotate(carts_count=Count('pk'))
+            .filter(carts_count__gt=1)
+            .values_list(field, flat=True)
+        )
+
+        for value in duplicated_values:
+            latest_cart = (
+                carts
+                .filter(**{field: value})
+                .order_by('-updated_at', '-created_at')
+                .first()
+            )
+            duplicated_carts_pks.extend(
+                carts
+                .filter(**{field: value})
+                .exclude(pk=latest_cart.pk)
+                .values_list('pk', flat=True)
+            )
+
+    if not duplicated_carts_pks:
+        return
+
+    cart_items_pks = list(
+        CartItem.objects
+        .filter(
+            Q(groups__cart__in=duplicated_carts_pks)
+            | Q(related_groups__cart__in=duplicated_carts_pks)
+        )
+        .values_list('pk', flat=True)
+        .distinct()
+    )
+    Cart.objects.filter(pk__in=duplicated_carts_pks).delete()
+    CartItem.objects.filter(pk__in=cart_items_pks).delete()
+
+    # run deferred foreign key checks of deleted rows,
+    # so unique constraints can be created in the same transaction
+    if schema_editor.connection.features.can_defer_constraint_checks:
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        schema_editor.execute('SET CONSTRAINTS ALL DEFERRED')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ok_cart', '0003_cart_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cart',
+            index=models.Index(condition=models.Q(('status', 'opened')), fields=['session_key'], name='ok_cart_open_session_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cartitem',
+            index=models.Index(fields=['content_type', 'object_id'], name='ok_cart_item_object_idx'),
+        ),
+        migrations.RunPython(
+            delete_duplicated_open_carts,
+            migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='cart',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'opened'), ('user__isnull', False)), fields=('user',), name='ok_cart_unique_open_user'),
+        ),
+        migrations.AddConstraint(
+            model_name='cart',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'opened'), ('user__isnull', True), models.Q(('session_key', ''), _negated=True)), fields=('session_key',), name='ok_cart_unique_open_session'),
+        ),
+    ]
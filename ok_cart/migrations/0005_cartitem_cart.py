@@ -0,0 +1,54 @@
+# Generated by Django 3.2.25 on 2026-10-17 19:45
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def fill_cart_items_cart(apps, schema_editor):
+    CartGroup = apps.get_model('ok_cart', 'CartGroup')
+    CartItem = apps.get_model('ok_cart', 'CartItem')
+
+    # base items
+    (
+        CartItem.objects
+        .filter(groups__isnull=False)
+        .update(
+            cart_id=Subquery(
+                CartGroup.objects
+                .filter(base_id=OuterRef('pk'))
+                .values('cart_id')[:1]
+            )
+        )
+    )
+    # related items
+    (
+        CartItem.objects
+        .filter(cart__isnull=True, related_groups__isnull=False)
+        .update(
+            cart_id=Subquery(
+                CartGroup.relations.through.objects
+                .filter(cartitem_id=OuterRef('pk'))
+                .values('cartgroup__cart_id')[:1]
+            )
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ok_cart', '0004_cart_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cartitem',
+            name='cart',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='items', to='ok_cart.cart', verbose_name='Cart'),
+        ),
+        migrations.RunPython(
+            fill_cart_items_cart,
+            migrations.RunPython.noop
+        ),
+    ]
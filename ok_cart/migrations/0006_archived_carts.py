@@ -0,0 +1,97 @@
+# Generated by Django 3.2.25 on 2026-10-17 20:05
+
+from decimal import Decimal
+from django.conf import settings
+import django.contrib.postgres.fields.jsonb
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('ok_cart', '0005_cartitem_cart'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedCart',
+            fields=[
+                ('created_at', models.DateTimeField(editable=False, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(editable=False, verbose_name='Updated at')),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Archived at')),
+                ('uuid', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('opened', 'Open'), ('closed', 'Closed')], max_length=10, verbose_name='Status')),
+                ('session_key', models.CharField(blank=True, max_length=255, verbose_name='Session key')),
+                ('quantity', models.PositiveIntegerField(default=0, verbose_name='Total quantity')),
+                ('total_price', models.DecimalField(decimal_places=2, default=Decimal('0.0'), max_digits=20, verbose_name='Total price')),
+                ('parameters', django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=dict)),
+                ('version', models.PositiveIntegerField(default=0, editable=False, verbose_name='Version')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_carts', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Archived cart',
+                'verbose_name_plural': 'Archived carts',
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedCartItem',
+            fields=[
+                ('created_at', models.DateTimeField(editable=False, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(editable=False, verbose_name='Updated at')),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Archived at')),
+                ('id', models.IntegerField(editable=False, primary_key=True, serialize=False)),
+                ('object_id', models.CharField(max_length=255, verbose_name='Object ID')),
+                ('price', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Price')),
+                ('quantity', models.PositiveIntegerField(default=0, verbose_name='Quantity')),
+                ('parameters', django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=dict)),
+                ('cart', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='items', to='ok_cart.archivedcart', verbose_name='Cart')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype', verbose_name="Related object's type (model)")),
+            ],
+            options={
+                'verbose_name': 'Archived cart item',
+                'verbose_name_plural': 'Archived cart items',
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedCartGroup',
+            fields=[
+                ('created_at', models.DateTimeField(editable=False, verbose_name='Created at')),
+                ('updated_at', models.DateTimeField(editable=False, verbose_name='Updated at')),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Archived at')),
+                ('id', models.IntegerField(editable=False, primary_key=True, serialize=False)),
+                ('price', models.DecimalField(decimal_places=2, default=0, max_digits=20, verbose_name='Price')),
+                ('quantity', models.PositiveIntegerField(default=0, verbose_name='Quantity')),
+                ('parameters', django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=dict)),
+                ('base', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='groups', to='ok_cart.archivedcartitem', verbose_name='Base item')),
+                ('cart', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='groups', to='ok_cart.archivedcart', verbose_name='Cart')),
+                ('relations', models.ManyToManyField(blank=True, related_name='related_groups', to='ok_cart.ArchivedCartItem', verbose_name='Related items')),
+            ],
+            options={
+                'verbose_name': 'Archived cart group',
+                'verbose_name_plural': 'Archived cart groups',
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedcartitem',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='ok_cart_arc_created_165eb7_brin'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcartgroup',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='ok_cart_arc_created_3372db_brin'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcart',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='ok_cart_arc_created_3541b7_brin'),
+        ),
+    ]
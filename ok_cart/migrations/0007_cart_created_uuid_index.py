@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ok_cart', '0006_archived_carts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cart',
+            index=models.Index(fields=['created_at', 'uuid'], name='ok_cart_created_uuid_idx'),
+        ),
+    ]
@@ -19,6 +19,10 @@ __all__ = (
     'Cart',
     'CartGroup',
     'CartItem',
+    'ArchiveMixin',
+    'ArchivedCart',
+    'ArchivedCartGroup',
+    'ArchivedCartItem',
 )
 
 
@@ -96,12 +100,56 @@ class Cart(TimestampsMixin):
         blank=True,
         default=dict
     )
+    version = models.PositiveIntegerField(
+        pgettext_lazy("Cart", "Version"),
+        default=0,
+        editable=False,
+        help_text=pgettext_lazy(
+            "Cart",
+            "Increments on every change of the cart."
+        ),
+    )
 
     objects = CartQueryset.as_manager()
 
     class Meta(TimestampsMixin.Meta):
         verbose_name = pgettext_lazy("Cart", "Cart")
         verbose_name_plural = pgettext_lazy("Cart", "Carts")
+        indexes = TimestampsMixin.Meta.indexes + (
+            # lookups of opened carts by session,
+            # lookups by user are covered by the unique constraint
+            models.Index(
+                fields=['session_key'],
+                condition=models.Q(status=CART_STATUS_OPENED),
+                name='ok_cart_open_session_idx',
+            ),
+            # keyset batches of cleanup and archiving
+            models.Index(
+                fields=['created_at', 'uuid'],
+                name='ok_cart_created_uuid_idx',
+            ),
+        )
+        constraints = (
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=models.Q(
+                    status=CART_STATUS_OPENED,
+                    user__isnull=False
+                ),
+                name='ok_cart_unique_open_user',
+            ),
+            models.UniqueConstraint(
+                fields=['session_key'],
+                condition=(
+                    models.Q(
+                        status=CART_STATUS_OPENED,
+                        user__isnull=True
+                    )
+                    & ~models.Q(session_key='')
+                ),
+                name='ok_cart_unique_open_session',
+            ),
+        )
 
     def __str__(self) -> str:
         if self.user_id:
@@ -122,6 +170,7 @@ class CartGroup(TimestampsMixin):
         base (ForeignKey): base element
         relations (M2M): related elements
         price (DecimalField): price of content object instance
+        quantity (PositiveIntegerField): total quantity of group's items
     """
     cart = models.ForeignKey(
         'ok_cart.Cart',
@@ -147,6 +196,10 @@ class CartGroup(TimestampsMixin):
         default=0,
         max_digits=20,
     )
+    quantity = models.PositiveIntegerField(
+        pgettext_lazy("Cart", "Quantity"),
+        default=0
+    )
     parameters = JSONField(
         blank=True,
         default=dict
@@ -161,6 +214,14 @@ class CartGroup(TimestampsMixin):
 
 
 class CartItem(TimestampsMixin):
+    cart = models.ForeignKey(
+        'ok_cart.Cart',
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name='items',
+        verbose_name=pgettext_lazy("Cart", "Cart"),
+    )
     content_type = models.ForeignKey(
         ContentType,
         on_delete=models.CASCADE,
@@ -202,6 +263,232 @@ class CartItem(TimestampsMixin):
     class Meta(TimestampsMixin.Meta):
         verbose_name = pgettext_lazy("Cart", "Cart item")
         verbose_name_plural = pgettext_lazy("Cart", "Cart items")
+        indexes = TimestampsMixin.Meta.indexes + (
+            models.Index(
+                fields=['content_type', 'object_id'],
+                name='ok_cart_item_object_idx',
+            ),
+        )
+
+    def __str__(self) -> str:
+        return smart_str(self.content_object)
+
+
+class ArchiveMixin(models.Model):
+    """
+    Archive abstract model, keeps original timestamps
+
+    Attrs:
+        created_at (DateTimeField): original created_at timestamp
+        updated_at (DateTimeField): original updated_at timestamp
+        archived_at (DateTimeField): archived_at timestamp
+    """
+    created_at = models.DateTimeField(
+        pgettext_lazy("Cart", 'Created at'),
+        editable=False
+    )
+    updated_at = models.DateTimeField(
+        pgettext_lazy("Cart", 'Updated at'),
+        editable=False
+    )
+    archived_at = models.DateTimeField(
+        pgettext_lazy("Cart", 'Archived at'),
+        default=now,
+        editable=False
+    )
+
+    class Meta:
+        abstract = True
+        indexes = (
+            BrinIndex(fields=['created_at']),
+        )
+        ordering = ['-created_at']
+
+
+class ArchivedCart(ArchiveMixin):
+    """
+    Closed cart, moved out of the carts table
+
+    Attrs:
+        uuid (UUIDField): original cart's uuid
+        status (CharField): cart's status
+        user (ForeignKey): user
+        session_key (CharField): session key
+        quantity (PositiveIntegerField): total quantity
+        total_price (DecimalField): total price
+        parameters (JSONField): parameters
+        version (PositiveIntegerField): cart's version
+    """
+    uuid = models.UUIDField(
+        editable=False,
+        primary_key=True,
+    )
+    status = models.CharField(
+        pgettext_lazy("Cart", "Status"),
+        choices=CART_STATUS_CHOICES,
+        max_length=10,
+    )
+    user = models.ForeignKey(
+        get_user_model(),
+        blank=True,
+        null=True,
+        related_name='archived_carts',
+        on_delete=models.SET_NULL,
+        verbose_name=pgettext_lazy("Cart", "User"),
+    )
+    session_key = models.CharField(
+        pgettext_lazy('Cart', 'Session key'),
+        blank=True,
+        max_length=255,
+    )
+    quantity = models.PositiveIntegerField(
+        pgettext_lazy("Cart", "Total quantity"),
+        default=0
+    )
+    total_price = models.DecimalField(
+        pgettext_lazy("Cart", "Total price"),
+        decimal_places=2,
+        default=Decimal('0.0'),
+        max_digits=20,
+    )
+    parameters = JSONField(
+        blank=True,
+        default=dict
+    )
+    version = models.PositiveIntegerField(
+        pgettext_lazy("Cart", "Version"),
+        default=0,
+        editable=False,
+    )
+
+    class Meta(ArchiveMixin.Meta):
+        verbose_name = pgettext_lazy("Cart", "Archived cart")
+        verbose_name_plural = pgettext_lazy("Cart", "Archived carts")
+
+    def __str__(self) -> str:
+        if self.user_id:
+            return smart_str(self.user)
+
+        return self.session_key
+
+    def __iter__(self):
+        return iter(self.groups.all())
+
+
+class ArchivedCartGroup(ArchiveMixin):
+    """
+    Group of archived cart
+
+    Attrs:
+        id (IntegerField): original group's id
+        cart (ForeignKey): archived cart
+        base (ForeignKey): base element
+        relations (M2M): related elements
+        price (DecimalField): price of content object instance
+        quantity (PositiveIntegerField): total quantity of group's items
+        parameters (JSONField): parameters
+    """
+    id = models.IntegerField(
+        primary_key=True,
+        editable=False,
+    )
+    cart = models.ForeignKey(
+        'ok_cart.ArchivedCart',
+        on_delete=models.CASCADE,
+        related_name='groups',
+        verbose_name=pgettext_lazy("Cart", "Cart"),
+    )
+    base = models.ForeignKey(
+        'ok_cart.ArchivedCartItem',
+        on_delete=models.CASCADE,
+        related_name='groups',
+        verbose_name=pgettext_lazy("Cart", "Base item")
+    )
+    relations = models.ManyToManyField(
+        'ok_cart.ArchivedCartItem',
+        blank=True,
+        related_name='related_groups',
+        verbose_name=pgettext_lazy("Cart", "Related items")
+    )
+    price = models.DecimalField(
+        pgettext_lazy('Cart', 'Price'),
+        decimal_places=2,
+        default=0,
+        max_digits=20,
+    )
+    quantity = models.PositiveIntegerField(
+        pgettext_lazy("Cart", "Quantity"),
+        default=0
+    )
+    parameters = JSONField(
+        blank=True,
+        default=dict
+    )
+
+    class Meta(ArchiveMixin.Meta):
+        verbose_name = pgettext_lazy("Cart", "Archived cart group")
+        verbose_name_plural = pgettext_lazy("Cart", "Archived cart groups")
+
+    def __str__(self) -> str:
+        return str(self.pk)
+
+
+class ArchivedCartItem(ArchiveMixin):
+    """
+    Item of archived cart
+
+    Attrs:
+        id (IntegerField): original item's id
+        cart (ForeignKey): archived cart
+        content_type (ForeignKey): related object's type
+        object_id (CharField): related object's id
+        price (DecimalField): price of content object instance
+        quantity (PositiveIntegerField): quantity
+        parameters (JSONField): parameters
+    """
+    id = models.IntegerField(
+        primary_key=True,
+        editable=False,
+    )
+    cart = models.ForeignKey(
+        'ok_cart.ArchivedCart',
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name='items',
+        verbose_name=pgettext_lazy("Cart", "Cart"),
+    )
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        verbose_name=pgettext_lazy(
+            'Cart',
+            'Related object\'s type (model)'
+        ),
+    )
+    object_id = models.CharField(
+        pgettext_lazy("Cart", "Object ID"),
+        max_length=255
+    )
+    content_object = GenericForeignKey()
+    price = models.DecimalField(
+        pgettext_lazy('Cart', 'Price'),
+        decimal_places=2,
+        default=0,
+        max_digits=20,
+    )
+    quantity = models.PositiveIntegerField(
+        pgettext_lazy("Cart", "Quantity"),
+        default=0
+    )
+    parameters = JSONField(
+        blank=True,
+        default=dict
+    )
+
+    class Meta(ArchiveMixin.Meta):
+        verbose_name = pgettext_lazy("Cart", "Archived cart item")
+        verbose_name_plural = pgettext_lazy("Cart", "Archived cart items")
 
     def __str__(self) -> str:
         return smart_str(self.content_object)
@@ -1,15 +1,21 @@
-from typing import Dict, Iterable, Optional, TYPE_CHECKING
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING
 
 from django.conf import settings as django_settings
 
+from .instrumentation import get_pipeline_phase_name, phase
 from .settings import settings
+from .utils import call_sync
 
 if TYPE_CHECKING:
     from django.db.models import Model
+    from .entities import CartAddEntry
     from .models import Cart, CartItem, CartGroup
 
 __all__ = (
+    'BulkUpdateBuffer',
     'run_add_pipelines',
+    'run_add_batch_pipelines',
     'run_post_add_pipelines',
 )
 
@@ -28,20 +34,92 @@ def run_add_pipelines(
     """
     Run pipelines after adding each passed item to the cart
     """
+    request = kwargs.get('request')
+
     for func in settings.ADD_PIPELINES:
         # cart item wasn't deleted
         if cart_item.pk:
-            func(
+            with phase(request, get_pipeline_phase_name('add', func)):
+                call_sync(
+                    func,
+                    cart=cart,
+                    user=user,
+                    content_object=content_object,
+                    cart_item=cart_item,
+                    cart_group=cart_group,
+                    quantity=quantity,
+                    parameters=parameters,
+                    **kwargs
+                )
+
+
+class BulkUpdateBuffer:
+    """
+    Collects changed instances to save them with `bulk_update`,
+    one query per model
+    """
+
+    def __init__(self):
+        self.instances = defaultdict(dict)
+        self.fields = defaultdict(set)
+
+    def add(self, instance: 'Model', fields: Iterable[str]) -> None:
+        """
+        Mark given fields of instance as changed
+        """
+        model = type(instance)
+        self.instances[model][instance.pk] = instance
+        self.fields[model].update(fields)
+
+    def flush(self) -> None:
+        """
+        Save all collected instances
+        """
+        for model, instances in self.instances.items():
+            model._default_manager.bulk_update(
+                list(instances.values()),
+                sorted(self.fields[model])
+            )
+
+        self.instances.clear()
+        self.fields.clear()
+
+
+def run_add_batch_pipelines(
+        *,
+        cart: 'Cart',
+        user: django_settings.AUTH_USER_MODEL,
+        entries: List['CartAddEntry'],
+        **kwargs
+):
+    """
+    Run batch pipelines once for all items, added to the cart,
+    and save instances, changed by pipelines, in bulk
+    """
+    pipelines = settings.ADD_BATCH_PIPELINES
+
+    if not pipelines:
+        return
+
+    # cart items weren't deleted
+    entries = [entry for entry in entries if entry.cart_item.pk]
+    buffer = BulkUpdateBuffer()
+    request = kwargs.get('request')
+
+    for func in pipelines:
+        with phase(request, get_pipeline_phase_name('add_batch', func)):
+            call_sync(
+                func,
                 cart=cart,
                 user=user,
-                content_object=content_object,
-                cart_item=cart_item,
-                cart_group=cart_group,
-                quantity=quantity,
-                parameters=parameters,
+                entries=entries,
+                buffer=buffer,
                 **kwargs
             )
 
+    with phase(request, 'add_batch_flush'):
+        buffer.flush()
+
 
 def run_post_add_pipelines(
         *,
@@ -53,10 +131,14 @@ def run_post_add_pipelines(
     """
     Run pipelines after adding all passed items to the cart
     """
+    request = kwargs.get('request')
+
     for func in settings.POST_ADD_PIPELINES:
-        func(
-            cart=cart,
-            user=user,
-            cart_items=cart_items,
-            **kwargs
-        )
+        with phase(request, get_pipeline_phase_name('post_add', func)):
+            call_sync(
+                func,
+                cart=cart,
+                user=user,
+                cart_items=cart_items,
+                **kwargs
+            )
@@ -12,6 +12,23 @@ class CartQueryset(models.QuerySet):
     A specialized queryset for dealing with carts.
     """
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._prefetch_elements = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._prefetch_elements = self._prefetch_elements
+        return clone
+
+    def _prefetch_related_objects(self):
+        super()._prefetch_related_objects()
+
+        if self._prefetch_elements:
+            from .selectors import prefetch_carts_content_objects
+
+            prefetch_carts_content_objects(carts=self._result_cache)
+
     def anonymous(self):
         """
         Return unassigned carts.
@@ -47,3 +64,12 @@ class CartQueryset(models.QuerySet):
                 'groups__relations',
             )
         )
+
+    def with_elements(self):
+        """
+        Return optimized carts with prefetched content objects
+        of base and related items, one query per content type
+        """
+        clone = self.optimized()
+        clone._prefetch_elements = True
+        return clone
@@ -1,26 +1,51 @@
-from typing import TYPE_CHECKING, Tuple, Union
+from collections import defaultdict
+from typing import (
+    Dict,
+    Iterable,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Type,
+    Union
+)
 
-from django.db.models import Q
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db.models import F
 
+from .cache import get_cart_cache, get_cart_price_info_cache_key
+from .consts import CART_SESSION_KEY
 from .entities import CartPriceInfo
-from .models import Cart, CartItem
+from .instrumentation import instrumented
+from .models import ArchivedCart, Cart, CartItem
 from .settings import settings
 
 if TYPE_CHECKING:
-    from django.contrib.contenttypes.models import ContentType
-    from django.db.models import QuerySet
+    from uuid import UUID
+
+    from django.db.models import Model, QuerySet
     from django.http.request import HttpRequest
 
 __all__ = (
     'get_cart_from_request',
+    'get_pinned_cart',
+    'pin_cart',
     'get_or_create_user_cart',
     'get_or_create_anonymous_cart',
     'get_cart_quantity_and_total_price',
     'get_cart_item',
+    'get_cart_items_by_keys',
     'get_cart_items_by_cart',
+    'get_content_objects',
+    'get_element_queryset',
+    'prefetch_cart_items_content_objects',
+    'prefetch_carts_content_objects',
+    'get_archived_carts',
+    'get_archived_cart',
 )
 
 
+@instrumented
 def get_cart_from_request(
         *,
         request: 'HttpRequest',
@@ -29,7 +54,18 @@ def get_cart_from_request(
 ) -> 'Cart':
     """
     Fetch cart from database or create a new one based on cookie
+
+    Resolved cart's uuid is pinned in the session, so next requests
+    fetch the cart by primary key
     """
+    cart = get_pinned_cart(
+        request=request,
+        cart_queryset=cart_queryset
+    )
+
+    if cart is not None:
+        return cart
+
     if request.user.is_authenticated:
         cart, _ = get_or_create_user_cart(
             user=request.user,
@@ -46,9 +82,57 @@ def get_cart_from_request(
             cart_queryset=cart_queryset,
             auto_create=auto_create
         )
+
+    pin_cart(request=request, cart=cart)
+
     return cart
 
 
+@instrumented
+def get_pinned_cart(
+        *,
+        request: 'HttpRequest',
+        cart_queryset: 'QuerySet' = Cart.objects.open().optimized()
+) -> Optional['Cart']:
+    """
+    Fetch cart by uuid, pinned in the session, if it's still
+    available in given queryset and belongs to the request's owner
+    """
+    cart_uuid = request.session.get(CART_SESSION_KEY)
+
+    if not cart_uuid:
+        return None
+
+    if request.user.is_authenticated:
+        owner_filter = {'user': request.user}
+    elif request.session.session_key:
+        owner_filter = {'session_key': request.session.session_key}
+    else:
+        return None
+
+    return (
+        cart_queryset
+        .filter(pk=cart_uuid, **owner_filter)
+        .first()
+    )
+
+
+def pin_cart(*, request: 'HttpRequest', cart: Optional['Cart']) -> None:
+    """
+    Store cart's uuid in the session or remove a stale one
+    """
+    if cart is None:
+        request.session.pop(CART_SESSION_KEY, None)
+        return
+
+    cart_uuid = str(cart.pk)
+
+    # avoid session saving on every request
+    if request.session.get(CART_SESSION_KEY) != cart_uuid:
+        request.session[CART_SESSION_KEY] = cart_uuid
+
+
+@instrumented
 def get_or_create_user_cart(
         *,
         user,
@@ -73,6 +157,7 @@ def get_or_create_user_cart(
     )
 
 
+@instrumented
 def get_or_create_anonymous_cart(
         *,
         session_key: str,
@@ -95,31 +180,56 @@ def get_or_create_anonymous_cart(
     )
 
 
+@instrumented
 def get_cart_quantity_and_total_price(
         *,
         request: 'HttpRequest',
 ) -> 'CartPriceInfo':
     """
-    Return total price and quantity for a current cart
+    Return total price and quantity for a current cart,
+    cached with `CART_CACHE_ENABLED` setting
     """
+    cache_key = None
+
+    if settings.CACHE_ENABLED:
+        cache_key = get_cart_price_info_cache_key(request=request)
+
+        if cache_key:
+            price_info = get_cart_cache().get(cache_key)
+
+            if price_info is not None:
+                return price_info
+
     cart = get_cart_from_request(
         request=request,
         cart_queryset=Cart.objects.open().only(
             'quantity',
             'total_price',
+            'version',
         ),
         auto_create=False
     )
     if cart:
-        quantity = cart.quantity
-        total_price = cart.total_price
+        price_info = CartPriceInfo(
+            quantity=cart.quantity,
+            total_price=cart.total_price,
+            uuid=cart.uuid,
+            version=cart.version
+        )
     else:
-        quantity = total_price = 0
+        price_info = CartPriceInfo(
+            quantity=0,
+            total_price=0
+        )
 
-    return CartPriceInfo(
-        quantity=quantity,
-        total_price=total_price
-    )
+    if cache_key:
+        get_cart_cache().set(
+            cache_key,
+            price_info,
+            timeout=settings.CACHE_TIMEOUT
+        )
+
+    return price_info
 
 
 def get_total_price(*, request: 'HttpRequest', cart: 'Cart'):
@@ -131,6 +241,7 @@ def get_total_price(*, request: 'HttpRequest', cart: 'Cart'):
     )
 
 
+@instrumented
 def get_cart_item(
         *,
         cart: 'Cart',
@@ -139,7 +250,8 @@ def get_cart_item(
 ) -> 'CartItem':
     cart_item: 'CartItem' = (
         CartItem.objects.filter(
-            groups__cart=cart,
+            cart=cart,
+            groups__isnull=False,
             content_type=content_type,
             object_id=object_id,
         )
@@ -148,16 +260,194 @@ def get_cart_item(
     return cart_item
 
 
+@instrumented
+def get_cart_items_by_keys(
+        *,
+        cart: 'Cart',
+        keys: Iterable[Tuple[int, str]]
+) -> Dict[Tuple[int, str], 'CartItem']:
+    """
+    Return cart's base items for given `(content_type_id, object_id)` pairs
+    with a single query, annotated with `cart_group_id`
+    """
+    keys = set(keys)
+
+    if not keys:
+        return {}
+
+    cart_items = (
+        CartItem.objects.filter(
+            cart=cart,
+            groups__isnull=False,
+            content_type_id__in={key[0] for key in keys},
+            object_id__in={key[1] for key in keys},
+        )
+        .annotate(cart_group_id=F('groups__id'))
+    )
+
+    return {
+        (cart_item.content_type_id, cart_item.object_id): cart_item
+        for cart_item in cart_items
+        if (cart_item.content_type_id, cart_item.object_id) in keys
+    }
+
+
 def get_cart_items_by_cart(
         *,
         cart: 'Cart',
         with_related: bool = True
 ) -> 'QuerySet':
-    query = Q(groups__cart=cart)
-
-    if with_related:
-        query |= Q(related_groups__cart=cart)
+    """
+    Return cart's items, only base ones without `with_related`
+    """
+    cart_items = CartItem.objects.filter(cart=cart)
 
-    cart_items = CartItem.objects.filter(query)
+    if not with_related:
+        cart_items = cart_items.filter(groups__isnull=False)
 
     return cart_items
+
+
+@instrumented
+def get_content_objects(
+        *,
+        keys: Iterable[Tuple['ContentType', Union[int, str]]]
+) -> Dict[Tuple[int, str], 'Model']:
+    """
+    Fetch objects for given `(content_type, object_id)` pairs
+    with one query per content type
+
+    Result is keyed by `(content_type_id, str(object_id))`,
+    missing objects are omitted.
+    """
+    object_ids_by_type = defaultdict(set)
+
+    for content_type, object_id in keys:
+        object_ids_by_type[content_type].add(str(object_id))
+
+    content_objects = {}
+
+    for content_type, object_ids in object_ids_by_type.items():
+        model_class = content_type.model_class()
+
+        if model_class is None:
+            continue
+
+        pk_field = model_class._meta.pk
+        object_ids_by_pk = {}
+
+        for object_id in object_ids:
+            try:
+                object_ids_by_pk[pk_field.to_python(object_id)] = object_id
+            except ValidationError:
+                continue
+
+        if not object_ids_by_pk:
+            continue
+
+        objects = (
+            get_element_queryset(model_class=model_class)
+            .in_bulk(list(object_ids_by_pk))
+        )
+
+        for pk, content_object in objects.items():
+            content_objects[
+                content_type.pk, object_ids_by_pk[pk]
+            ] = content_object
+
+    return content_objects
+
+
+def get_element_queryset(*, model_class: Type['Model']) -> 'QuerySet':
+    """
+    Return queryset to fetch cart elements of given model,
+    customized with `CART_ELEMENT_QUERYSETS` setting
+    """
+    label = model_class._meta.label_lower
+
+    for model_path, queryset in settings.ELEMENT_QUERYSETS.items():
+        if model_path.lower() == label:
+            return queryset() if callable(queryset) else queryset.all()
+
+    return model_class._base_manager.all()
+
+
+@instrumented
+def prefetch_cart_items_content_objects(
+        *,
+        cart_items: Iterable['CartItem']
+) -> None:
+    """
+    Populate `content_object` of given cart items
+    with one query per content type
+    """
+    cart_items = list(cart_items)
+    content_objects = get_content_objects(
+        keys=[
+            (
+                ContentType.objects.get_for_id(cart_item.content_type_id),
+                cart_item.object_id
+            )
+            for cart_item in cart_items
+        ]
+    )
+    field = CartItem._meta.get_field('content_object')
+
+    for cart_item in cart_items:
+        content_object = content_objects.get(
+            (cart_item.content_type_id, str(cart_item.object_id))
+        )
+
+        if content_object is not None:
+            field.set_cached_value(cart_item, content_object)
+
+
+@instrumented
+def prefetch_carts_content_objects(*, carts: Iterable['Cart']) -> None:
+    """
+    Populate `content_object` of base and related items
+    of carts with prefetched groups
+    """
+    prefetch_cart_items_content_objects(
+        cart_items=[
+            cart_item
+            for cart in carts
+            for cart_group in cart.groups.all()
+            for cart_item in (
+                cart_group.base,
+                *cart_group.relations.all()
+            )
+        ]
+    )
+
+
+def get_archived_carts(*, user) -> 'QuerySet':
+    """
+    Return user's archived carts with prefetched groups and items
+    """
+    return (
+        ArchivedCart.objects
+        .filter(user=user)
+        .prefetch_related(
+            'groups',
+            'groups__base',
+            'groups__relations',
+        )
+    )
+
+
+@instrumented
+def get_archived_cart(*, uuid: Union['UUID', str]) -> Optional['ArchivedCart']:
+    """
+    Return archived cart by original cart's uuid
+    """
+    return (
+        ArchivedCart.objects
+        .filter(uuid=uuid)
+        .prefetch_related(
+            'groups',
+            'groups__base',
+            'groups__relations',
+        )
+        .first()
+    )
@@ -1,5 +1,9 @@
+from .archive import *
 from .calculations import *
 from .cart import *
 from .cart_group import *
 from .cart_item import *
+from .cleanup import *
 from .merge import *
+from .prices import *
+from .version import *
@@ -0,0 +1,133 @@
+import time
+from datetime import datetime
+from typing import Iterable, TYPE_CHECKING
+
+from django.db import transaction
+
+from .cleanup import delete_carts, iterate_carts_pks
+from ..instrumentation import instrumented
+from ..models import (
+    ArchivedCart,
+    ArchivedCartGroup,
+    ArchivedCartItem,
+    Cart,
+    CartGroup,
+    CartItem
+)
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from django.db.models import Model, QuerySet
+
+__all__ = (
+    'archive_carts',
+    'archive_closed_carts',
+)
+
+
+def get_archived_fields(model: 'Model'):
+    return [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.name != 'archived_at'
+    ]
+
+
+@instrumented
+def archive_carts(*, cart_pks: Iterable['UUID']) -> int:
+    """
+    Move carts with their groups, groups' relations and items
+    to archive tables with one query per table
+
+    Returns number of archived carts.
+    """
+    cart_pks = list(cart_pks)
+
+    if not cart_pks:
+        return 0
+
+    relations = CartGroup.relations.through
+    archived_relations = ArchivedCartGroup.relations.through
+
+    with transaction.atomic():
+        carts = (
+            Cart.objects
+            .select_for_update()
+            .filter(pk__in=cart_pks)
+            .values(*get_archived_fields(ArchivedCart))
+        )
+        ArchivedCart.objects.bulk_create(
+            [ArchivedCart(**values) for values in carts]
+        )
+        ArchivedCartItem.objects.bulk_create([
+            ArchivedCartItem(**values)
+            for values in (
+                CartItem.objects
+                .filter(cart_id__in=cart_pks)
+                .values(*get_archived_fields(ArchivedCartItem))
+            )
+        ])
+        ArchivedCartGroup.objects.bulk_create([
+            ArchivedCartGroup(**values)
+            for values in (
+                CartGroup.objects
+                .filter(cart_id__in=cart_pks)
+                .values(*get_archived_fields(ArchivedCartGroup))
+            )
+        ])
+        archived_relations.objects.bulk_create([
+            archived_relations(
+                archivedcartgroup_id=cartgroup_id,
+                archivedcartitem_id=cartitem_id
+            )
+            for cartgroup_id, cartitem_id in (
+                relations.objects
+                .filter(
+                    cartgroup__cart_id__in=cart_pks,
+                    cartitem__cart_id__in=cart_pks
+                )
+                .values_list('cartgroup_id', 'cartitem_id')
+            )
+        ])
+
+        return delete_carts(cart_pks=cart_pks)
+
+
+@instrumented
+def archive_closed_carts(
+        *,
+        closed_before: datetime = None,
+        batch_size: int = 1000,
+        sleep: float = 0,
+        dry_run: bool = False
+) -> int:
+    """
+    Move closed carts, not changed since given time, to archive tables
+    in batches (see `iterate_carts_pks`), sleeping between batches
+
+    Returns number of archived carts or number of carts to archive
+    with `dry_run`.
+    """
+    carts: 'QuerySet' = Cart.objects.closed()
+
+    if closed_before:
+        carts = carts.filter(
+            created_at__lt=closed_before,
+            updated_at__lt=closed_before
+        )
+
+    total = 0
+
+    for index, cart_pks in enumerate(
+            iterate_carts_pks(carts=carts, batch_size=batch_size)
+    ):
+        if index and sleep:
+            time.sleep(sleep)
+
+        if dry_run:
+            total += len(cart_pks)
+        else:
+            total += archive_carts(cart_pks=cart_pks)
+
+    return total
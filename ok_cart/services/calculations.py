@@ -1,54 +1,161 @@
-from typing import TYPE_CHECKING
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, TYPE_CHECKING, Tuple, Union
 
 from django.db.models import (
     DecimalField,
     ExpressionWrapper,
     F,
+    OuterRef,
     Q,
+    Subquery,
     Sum,
+    Value,
 )
+from django.db.models.functions import Coalesce
 
-from ..models import CartItem
+from .version import touch_cart
+from ..instrumentation import instrumented
+from ..models import Cart, CartGroup, CartItem
 from ..selectors import get_cart_items_by_cart
 
 if TYPE_CHECKING:
-    from decimal import Decimal
-    from ..models import Cart, CartGroup
+    from django.db.models import Expression, QuerySet
 
 __all__ = (
+    'get_cart_groups_totals_expressions',
     'update_cart_group_price',
+    'update_carts_groups_price_and_quantity',
+    'refresh_prefetched_cart_groups',
     'calculate_cart_group_quantity',
-    'update_cart_quantity_and_total_price'
+    'update_cart_quantity_and_total_price',
+    'apply_cart_totals_delta',
+    'apply_cart_groups_totals_delta',
+    'subtract_cart_groups_totals',
 )
 
 
-def update_cart_group_price(
-        *, cart_group: 'CartGroup'
-) -> None:
-    cart_items_total_price = (
+def get_cart_groups_totals_expressions() -> Dict[str, 'Expression']:
+    """
+    Return expressions to calculate price and quantity of a cart group
+    from its base and related items, usable in `update()`
+    """
+    price_expression = ExpressionWrapper(
+        F('price') * F('quantity'),
+        output_field=DecimalField()
+    )
+    base_items = (
         CartItem.objects
-        .filter(
-            Q(groups=cart_group) |
-            Q(related_groups=cart_group)
-        )
-        .aggregate(
-            total_price=Sum(
+        .filter(pk=OuterRef('base_id'))
+    )
+    related_items_totals = (
+        CartGroup.relations.through.objects
+        .filter(cartgroup_id=OuterRef('pk'))
+        .order_by()
+        .values('cartgroup_id')
+        .annotate(
+            price=Sum(
                 ExpressionWrapper(
-                    F('price') * F('quantity'),
+                    F('cartitem__price') * F('cartitem__quantity'),
                     output_field=DecimalField()
                 )
+            ),
+            quantity=Sum('cartitem__quantity')
+        )
+    )
+    zero_price = Value(0, output_field=DecimalField())
+
+    return {
+        'price': (
+            Coalesce(
+                Subquery(
+                    base_items.values(total_price=price_expression),
+                    output_field=DecimalField()
+                ),
+                zero_price
             )
-        )['total_price'] or 0
+            + Coalesce(
+                Subquery(
+                    related_items_totals.values('price'),
+                    output_field=DecimalField()
+                ),
+                zero_price
+            )
+        ),
+        'quantity': (
+            Coalesce(Subquery(base_items.values('quantity')), 0)
+            + Coalesce(Subquery(related_items_totals.values('quantity')), 0)
+        ),
+    }
+
+
+@instrumented
+def update_cart_group_price(
+        *, cart_group: 'CartGroup'
+) -> None:
+    """
+    Recalculate and save price and quantity of a single cart group
+    and touch its cart
+    """
+    (
+        CartGroup.objects
+        .filter(pk=cart_group.pk)
+        .update(**get_cart_groups_totals_expressions())
+    )
+    cart_group.refresh_from_db(fields=['price', 'quantity'])
+    touch_cart(cart=cart_group.cart_id)
+
+
+@instrumented
+def update_carts_groups_price_and_quantity(
+        *, carts: Union[Iterable['Cart'], 'QuerySet']
+) -> None:
+    """
+    Recalculate and save price and quantity of all groups
+    of given carts with a single query
+    """
+    (
+        CartGroup.objects
+        .filter(cart__in=carts)
+        .update(**get_cart_groups_totals_expressions())
     )
-    cart_group.price = cart_items_total_price
-    cart_group.save(update_fields=[
-        'price'
-    ])
 
 
+@instrumented
+def refresh_prefetched_cart_groups(*, cart: 'Cart') -> None:
+    """
+    Reload price and quantity of cart's prefetched groups
+    with a single query
+    """
+    prefetched_objects = getattr(cart, '_prefetched_objects_cache', {})
+
+    if 'groups' not in prefetched_objects:
+        return
+
+    cart_groups_totals = {
+        pk: (price, quantity)
+        for pk, price, quantity in (
+            CartGroup.objects
+            .filter(cart=cart)
+            .values_list('pk', 'price', 'quantity')
+        )
+    }
+
+    for cart_group in prefetched_objects['groups']:
+        if cart_group.pk in cart_groups_totals:
+            cart_group.price, cart_group.quantity = (
+                cart_groups_totals[cart_group.pk]
+            )
+
+
+@instrumented
 def calculate_cart_group_quantity(
         *, cart_group: 'CartGroup'
 ) -> 'Decimal':
+    """
+    Aggregate quantity of cart group's items.
+    Saved value is available as `cart_group.quantity`.
+    """
     cart_items_total_quantity = (
         CartItem.objects
         .filter(
@@ -59,10 +166,10 @@ def calculate_cart_group_quantity(
             total_quantity=Sum('quantity')
         )['total_quantity'] or 0
     )
-    # TODO: save quantity to DB?
     return cart_items_total_quantity
 
 
+@instrumented
 def update_cart_quantity_and_total_price(
         *, cart: 'Cart'
 ) -> None:
@@ -88,9 +195,86 @@ def update_cart_quantity_and_total_price(
         or 0
     )
 
-    cart.total_price = total_price
-    cart.quantity = quantity
-    cart.save()
+    update_carts_groups_price_and_quantity(carts=[cart])
+    refresh_prefetched_cart_groups(cart=cart)
+    touch_cart(
+        cart=cart,
+        quantity=quantity,
+        total_price=total_price
+    )
+
+
+@instrumented
+def apply_cart_totals_delta(
+        *,
+        cart: Union['Cart', int, str],
+        quantity: int = 0,
+        price: Union['Decimal', int] = 0
+) -> None:
+    """
+    Atomically shift cart's quantity and total price by given deltas
+    """
+    touch_cart(
+        cart=cart,
+        quantity=F('quantity') + quantity,
+        total_price=F('total_price') + price
+    )
+
+    if isinstance(cart, Cart):
+        # deferred fields would be loaded with the deltas already applied
+        deferred_fields = cart.get_deferred_fields()
+
+        if 'quantity' not in deferred_fields:
+            cart.quantity += quantity
+
+        if 'total_price' not in deferred_fields:
+            cart.total_price += price
+
+
+@instrumented
+def apply_cart_groups_totals_delta(
+        *,
+        deltas: Dict[int, Tuple[int, 'Decimal']]
+) -> None:
+    """
+    Atomically shift quantities and prices of cart groups
+    by given `(quantity, price)` deltas, keyed by cart group's id
+    """
+    cart_groups = [
+        CartGroup(
+            pk=cart_group_pk,
+            quantity=F('quantity') + quantity,
+            price=F('price') + price
+        )
+        for cart_group_pk, (quantity, price) in deltas.items()
+        if quantity or price
+    ]
 
-    for group in cart.groups.all():
-        update_cart_group_price(cart_group=group)
+    if cart_groups:
+        CartGroup.objects.bulk_update(cart_groups, ['quantity', 'price'])
+
+
+@instrumented
+def subtract_cart_groups_totals(*, cart_groups: 'QuerySet') -> None:
+    """
+    Subtract totals of cart groups, which are going to be deleted,
+    from their carts
+    """
+    cart_groups_totals = (
+        cart_groups
+        .order_by()
+        .values('cart_id', 'quantity', 'price')
+    )
+    deltas = defaultdict(lambda: [0, Decimal('0')])
+
+    for totals in cart_groups_totals:
+        delta = deltas[totals['cart_id']]
+        delta[0] -= totals['quantity']
+        delta[1] -= totals['price']
+
+    for cart_pk, (quantity, price) in deltas.items():
+        apply_cart_totals_delta(
+            cart=cart_pk,
+            quantity=quantity,
+            price=price
+        )
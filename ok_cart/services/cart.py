@@ -1,19 +1,36 @@
-from typing import Dict, TYPE_CHECKING, Optional, Tuple, Union
+from collections import defaultdict
+from dataclasses import replace
+from decimal import Decimal
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TYPE_CHECKING,
+    Tuple,
+    Union
+)
 
 from django.conf import settings
+from django.db import transaction
+from django.utils.timezone import now
 
 from ..consts import CART_STATUS_CLOSED
+from ..entities import CartItemEntity
+from ..instrumentation import instrumented
 from ..models import Cart, CartItem, CartGroup
 from ..selectors import (
-    get_cart_item,
-    get_cart_items_by_cart
+    get_cart_items_by_cart,
+    get_cart_items_by_keys
 )
-from ..services.cart_item import (
-    create_cart_item,
-    delete_cart_item,
-    update_cart_item
+from ..services.calculations import (
+    apply_cart_groups_totals_delta,
+    apply_cart_totals_delta
 )
+from ..services.cart_item import delete_cart_items
+from ..services.version import touch_cart
 from ..settings import settings as cart_settings
+from ..utils import call_sync
 
 if TYPE_CHECKING:
     from django.contrib.contenttypes.models import ContentType
@@ -21,12 +38,16 @@ if TYPE_CHECKING:
 
 __all__ = (
     'add_item_to_cart',
+    'add_items_to_cart',
+    'lock_cart',
+    'collapse_cart_item_entities',
     'clear_cart',
     'close_cart',
     'cart_is_empty',
 )
 
 
+@instrumented
 def add_item_to_cart(
         *,
         cart: 'Cart',
@@ -40,68 +61,228 @@ def add_item_to_cart(
     """
     Add object to cart by given content type and object's id
     """
-    cart_item: 'CartItem' = get_cart_item(
+    [(_, cart_item, cart_group)] = add_items_to_cart(
         cart=cart,
-        content_type=content_type,
-        object_id=object_id
+        user=user,
+        entities=[
+            CartItemEntity(
+                content_type=content_type,
+                object_id=object_id,
+                content_object=content_object,
+                quantity=quantity,
+                parameters=parameters
+            )
+        ]
     )
-    cart_group = None
 
-    if cart_item:
-        cart_item.quantity += quantity
+    return cart_item, cart_group
 
-        for validator in cart_settings.CART_ITEM_QUANTITY_VALIDATORS:
-            validator(
-                cart_item=cart_item
-            )
 
-        if cart_item.quantity <= 0:
-            delete_cart_item(
-                cart_item=cart_item
-            )
+@instrumented
+@transaction.atomic()
+def add_items_to_cart(
+        *,
+        cart: 'Cart',
+        user: 'settings.AUTH_USER_MODEL',
+        entities: Iterable['CartItemEntity']
+) -> List[Tuple['CartItemEntity', 'CartItem', Optional['CartGroup']]]:
+    """
+    Add several objects to cart at once
+
+    Entities for the same object are collapsed into one, existing items
+    are fetched with a single query and all changes are written in bulk,
+    so the number of queries doesn't depend on the number of entities.
+
+    With `CART_INCREMENTAL_TOTALS` enabled cart and groups totals
+    are shifted by the changes instead of being recalculated.
+
+    Cart's row is locked until the end of the transaction, so concurrent
+    additions to the same cart are applied one after another and
+    validators see actual quantities.
+
+    Returns `(entity, cart_item, cart_group)` for every collapsed entity.
+    `cart_group` is set only for newly created items, deleted or skipped
+    items have no primary key.
+    """
+    lock_cart(cart=cart)
+    entities = collapse_cart_item_entities(entities=entities)
+    existing_items = get_cart_items_by_keys(
+        cart=cart,
+        keys=[entity.key for entity in entities]
+    )
+    now_ = now()
+    results = []
+    items_to_create = []
+    items_to_update = []
+    items_to_delete = []
+    quantity_delta = 0
+    price_delta = Decimal('0')
+    cart_groups_deltas = defaultdict(lambda: [0, Decimal('0')])
+
+    for entity in entities:
+        cart_item = existing_items.get(entity.key)
+
+        if cart_item:
+            old_quantity = cart_item.quantity
+            cart_item.quantity += entity.quantity
+
+            for validator in cart_settings.CART_ITEM_QUANTITY_VALIDATORS:
+                call_sync(
+                    validator,
+                    cart_item=cart_item
+                )
+
+            if cart_item.quantity <= 0:
+                items_to_delete.append(cart_item)
+            else:
+                if entity.parameters:
+                    cart_item.parameters = entity.parameters
 
-            if cart_is_empty(cart=cart):
-                clear_cart(cart=cart)
+                cart_item.updated_at = now_
+                items_to_update.append(cart_item)
 
+                item_quantity_delta = cart_item.quantity - old_quantity
+                item_price_delta = cart_item.price * item_quantity_delta
+                quantity_delta += item_quantity_delta
+                price_delta += item_price_delta
+                cart_group_delta = cart_groups_deltas[cart_item.cart_group_id]
+                cart_group_delta[0] += item_quantity_delta
+                cart_group_delta[1] += item_price_delta
         else:
-            update_cart_item(
-                cart_item=cart_item,
+            if entity.content_object is not None:
+                cart_item = CartItem(content_object=entity.content_object)
+            else:
+                cart_item = CartItem(
+                    content_type=entity.content_type,
+                    object_id=entity.object_id
+                )
+
+            cart_item.cart = cart
+            cart_item.quantity = entity.quantity
+            cart_item.parameters = entity.parameters or {}
+            cart_item.created_at = cart_item.updated_at = now_
+
+            # nothing to remove from the cart
+            if entity.quantity > 0:
+                items_to_create.append(cart_item)
+                quantity_delta += cart_item.quantity
+                price_delta += cart_item.price * cart_item.quantity
+
+        results.append([entity, cart_item, None])
+
+    if items_to_update:
+        CartItem.objects.bulk_update(
+            items_to_update,
+            ['quantity', 'parameters', 'updated_at']
+        )
+
+    if items_to_create:
+        CartItem.objects.bulk_create(items_to_create)
+        cart_groups = CartGroup.objects.bulk_create([
+            CartGroup(
                 cart=cart,
-                user=user,
-                parameters=parameters
+                base=cart_item,
+                price=cart_item.price * cart_item.quantity,
+                quantity=cart_item.quantity,
+                parameters=cart_item.parameters,
+                created_at=now_,
+                updated_at=now_
             )
-    else:
-        cart_item, cart_group = create_cart_item(
+            for cart_item in items_to_create
+        ])
+        groups_by_item = {
+            cart_group.base_id: cart_group
+            for cart_group in cart_groups
+        }
+
+        for result in results:
+            result[2] = groups_by_item.get(result[1].pk)
+
+    if cart_settings.INCREMENTAL_TOTALS:
+        apply_cart_groups_totals_delta(deltas=cart_groups_deltas)
+        apply_cart_totals_delta(
             cart=cart,
-            user=user,
-            content_object=content_object,
-            quantity=quantity,
-            parameters=parameters
+            quantity=quantity_delta,
+            price=price_delta
         )
+    else:
+        touch_cart(cart=cart)
 
-    return cart_item, cart_group
+    if items_to_delete:
+        delete_cart_items(cart_items=items_to_delete)
+
+        if cart_is_empty(cart=cart):
+            clear_cart(cart=cart)
+
+    return [tuple(result) for result in results]
+
+
+def collapse_cart_item_entities(
+        *,
+        entities: Iterable['CartItemEntity']
+) -> List['CartItemEntity']:
+    """
+    Merge entities for the same object, summing their quantities.
+    Latest non-empty parameters win, as with sequential additions.
+    """
+    collapsed = {}
+
+    for entity in entities:
+        existing = collapsed.get(entity.key)
+
+        if existing is None:
+            collapsed[entity.key] = replace(entity)
+            continue
 
+        existing.quantity += entity.quantity
 
+        if entity.parameters:
+            existing.parameters = entity.parameters
+
+        if existing.content_object is None:
+            existing.content_object = entity.content_object
+
+    return list(collapsed.values())
+
+
+@instrumented
+def lock_cart(*, cart: 'Cart') -> None:
+    """
+    Lock cart's row until the end of the current transaction
+    """
+    list(
+        Cart.objects
+        .select_for_update()
+        .filter(pk=cart.pk)
+        .values_list('pk', flat=True)
+    )
+
+
+@instrumented
 def clear_cart(*, cart: 'Cart') -> None:
     get_cart_items_by_cart(cart=cart).delete()
     CartGroup.objects.filter(cart=cart).delete()
-    cart.quantity = 0
-    cart.total_price = 0
-    cart.save(update_fields=['quantity', 'total_price'])
+    touch_cart(
+        cart=cart,
+        quantity=0,
+        total_price=0
+    )
 
 
+@instrumented
 def close_cart(*, cart: 'Cart') -> None:
-    cart.status = CART_STATUS_CLOSED
-    cart.save(update_fields=[
-        'status',
-    ])
+    touch_cart(
+        cart=cart,
+        status=CART_STATUS_CLOSED
+    )
 
 
+@instrumented
 def cart_is_empty(*, cart: 'Cart') -> bool:
     return not (
-        CartItem.objects
+        CartGroup.objects
         .filter(
-            groups__cart=cart,
+            cart=cart,
         )
         .exists()
     )
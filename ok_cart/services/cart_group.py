@@ -1,17 +1,37 @@
-from typing import TYPE_CHECKING
-
-if TYPE_CHECKING:
-    from ..models import CartGroup
+from .calculations import subtract_cart_groups_totals
+from .cart_item import delete_detached_cart_items
+from .version import touch_cart
+from ..instrumentation import instrumented
+from ..models import CartGroup
+from ..settings import settings as cart_settings
 
 __all__ = (
     'delete_cart_group',
 )
 
 
+@instrumented
 def delete_cart_group(*, cart_group: 'CartGroup'):
+    """
+    Delete group with its base item and related items,
+    which don't belong to other groups
+    """
+    related_items_pks = list(
+        cart_group.relations.values_list('pk', flat=True)
+    )
+
+    # totals subtraction touches the cart as well
+    if cart_settings.INCREMENTAL_TOTALS:
+        subtract_cart_groups_totals(
+            cart_groups=CartGroup.objects.filter(pk=cart_group.pk)
+        )
+
+    # base's deletion cascades to the group and its relations
     if cart_group.base:
         cart_group.base.delete()
 
-    cart_group.relations.all().delete()
-
     cart_group.delete()
+    delete_detached_cart_items(cart_item_pks=related_items_pks)
+
+    if not cart_settings.INCREMENTAL_TOTALS:
+        touch_cart(cart=cart_group.cart_id)
@@ -1,8 +1,12 @@
-from typing import Dict, TYPE_CHECKING, Tuple
+from typing import Dict, Iterable, TYPE_CHECKING, Tuple
 
 from django.conf import settings
 
+from .calculations import subtract_cart_groups_totals
+from ..instrumentation import instrumented
 from ..models import CartGroup, CartItem
+from .version import touch_cart
+from ..settings import settings as cart_settings
 
 if TYPE_CHECKING:
     from django.db.models import Model
@@ -12,9 +16,13 @@ __all__ = (
     'create_cart_item',
     'update_cart_item',
     'delete_cart_item',
+    'delete_cart_items',
+    'delete_detached_cart_items',
+    'detach_cart_items',
 )
 
 
+@instrumented
 def create_cart_item(
         *,
         cart: 'Cart',
@@ -24,6 +32,7 @@ def create_cart_item(
         parameters: Dict = None
 ) -> Tuple['CartItem', 'CartGroup']:
     cart_item = CartItem.objects.create(
+        cart=cart,
         content_object=content_object,
         quantity=quantity,
         parameters=parameters or {}
@@ -32,12 +41,15 @@ def create_cart_item(
     cart_group = CartGroup.objects.create(
         cart=cart,
         base=cart_item,
+        quantity=quantity,
         parameters=parameters or {}
     )
+    touch_cart(cart=cart)
 
     return cart_item, cart_group
 
 
+@instrumented
 def update_cart_item(
         *,
         cart_item: 'CartItem',
@@ -53,8 +65,95 @@ def update_cart_item(
         cart_item.parameters = parameters
 
     cart_item.save()
+    touch_cart(cart=cart)
 
 
+@instrumented
 def delete_cart_item(*, cart_item: 'CartItem'):
-    cart_item.groups.all().delete()
-    cart_item.delete()
+    delete_cart_items(cart_items=[cart_item])
+
+
+@instrumented
+def delete_cart_items(*, cart_items: Iterable['CartItem']):
+    """
+    Delete given items with their groups, groups' related items
+    and touch their carts
+    """
+    cart_items = list(cart_items)
+    cart_groups = CartGroup.objects.filter(base__in=cart_items)
+    related_items_pks = list(
+        CartGroup.relations.through.objects
+        .filter(cartgroup__base__in=cart_items)
+        .values_list('cartitem_id', flat=True)
+    )
+    carts = {}
+
+    # totals subtraction touches carts itself
+    if cart_settings.INCREMENTAL_TOTALS:
+        subtract_cart_groups_totals(cart_groups=cart_groups)
+    else:
+        cart_field = CartItem._meta.get_field('cart')
+
+        for cart_pk in cart_groups.values_list('cart_id', flat=True):
+            carts[cart_pk] = cart_pk
+
+        # touch loaded carts to keep their versions actual
+        for cart_item in cart_items:
+            if cart_field.is_cached(cart_item) and cart_item.cart:
+                carts[cart_item.cart_id] = cart_item.cart
+
+    cart_groups.delete()
+    CartItem.objects.filter(pk__in=[item.pk for item in cart_items]).delete()
+
+    for cart_item in cart_items:
+        cart_item.pk = None
+
+    delete_detached_cart_items(cart_item_pks=related_items_pks)
+
+    for cart in carts.values():
+        touch_cart(cart=cart)
+
+
+@instrumented
+def delete_detached_cart_items(*, cart_item_pks: Iterable[int]) -> None:
+    """
+    Delete given items, which are neither base nor related items
+    of any group, e.g. related items of deleted groups
+    """
+    cart_item_pks = list(cart_item_pks)
+
+    if not cart_item_pks:
+        return
+
+    (
+        CartItem.objects
+        .filter(
+            pk__in=cart_item_pks,
+            groups__isnull=True,
+            related_groups__isnull=True
+        )
+        .delete()
+    )
+
+
+@instrumented
+def detach_cart_items(*, cart_item_pks: Iterable[int]) -> None:
+    """
+    Unset cart of given items, which are neither base
+    nor related items of any group
+    """
+    cart_item_pks = list(cart_item_pks)
+
+    if not cart_item_pks:
+        return
+
+    (
+        CartItem.objects
+        .filter(
+            pk__in=cart_item_pks,
+            cart__isnull=False,
+            groups__isnull=True,
+            related_groups__isnull=True
+        )
+        .update(cart=None)
+    )
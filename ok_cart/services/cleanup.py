@@ -0,0 +1,208 @@
+import time
+from datetime import datetime
+from typing import Iterable, Iterator, List, TYPE_CHECKING
+
+from django.db import router, transaction
+from django.db.models import Exists, OuterRef, Q
+
+from ..consts import CART_STATUS_CLOSED
+from ..instrumentation import instrumented
+from ..models import Cart, CartGroup, CartItem
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from django.db.models import QuerySet
+
+__all__ = (
+    'iterate_carts_pks',
+    'get_stale_carts',
+    'delete_carts',
+    'delete_stale_carts',
+)
+
+
+def iterate_carts_pks(
+        *,
+        carts: 'QuerySet',
+        batch_size: int = 1000
+) -> Iterator[List['UUID']]:
+    """
+    Yield primary keys of given carts in batches, ordered by
+    `(created_at, uuid)` keyset
+
+    Each batch is an index scan of `(created_at, uuid)` index,
+    started from the last key of the previous batch, so batches
+    don't rescan already processed carts.
+    """
+    carts = carts.order_by('created_at', 'uuid')
+    last_key = None
+
+    while True:
+        batch = carts
+
+        if last_key is not None:
+            last_created_at, last_uuid = last_key
+            # `created_at__gte` is the index scan's start
+            batch = batch.filter(
+                Q(created_at__gt=last_created_at)
+                | Q(created_at=last_created_at, uuid__gt=last_uuid),
+                created_at__gte=last_created_at
+            )
+
+        keys = list(
+            batch.values_list('created_at', 'uuid')[:batch_size]
+        )
+
+        if not keys:
+            return
+
+        last_key = keys[-1]
+
+        yield [key[1] for key in keys]
+
+        if len(keys) < batch_size:
+            return
+
+
+def get_stale_carts(
+        *,
+        cutoff: datetime,
+        anonymous: bool = True,
+        empty: bool = True,
+        closed: bool = True
+) -> 'QuerySet':
+    """
+    Return carts, which weren't changed since cutoff and are either
+    anonymous, empty or closed
+    """
+    carts = Cart.objects.all()
+    query = Q()
+
+    if anonymous:
+        query |= Q(user__isnull=True)
+
+    if empty:
+        # negated `Exists` can't be used in `filter()` before Django 3.0
+        carts = carts.annotate(
+            has_groups=Exists(CartGroup.objects.filter(cart=OuterRef('pk')))
+        )
+        query |= Q(has_groups=False)
+
+    if closed:
+        query |= Q(status=CART_STATUS_CLOSED)
+
+    if not query:
+        return Cart.objects.none()
+
+    return (
+        carts
+        # `created_at` filter is served by BRIN index
+        .filter(
+            query,
+            created_at__lt=cutoff,
+            updated_at__lt=cutoff,
+        )
+    )
+
+
+@instrumented
+def delete_carts(
+        *,
+        cart_pks: Iterable['UUID'],
+        carts: 'QuerySet' = None
+) -> int:
+    """
+    Delete carts with their groups, groups' relations and items
+    with one query per table, bypassing Django's deletion collector
+
+    With `carts` queryset only carts, which still match it, are deleted.
+    They are locked and filtered again in the deleting transaction, so
+    carts, changed after their keys were selected, are kept.
+
+    Signals aren't sent for deleted rows. Returns number of deleted carts.
+    """
+    cart_pks = list(cart_pks)
+
+    if not cart_pks:
+        return 0
+
+    using = router.db_for_write(Cart)
+    relations = CartGroup.relations.through.objects.using(using)
+
+    with transaction.atomic(using=using):
+        if carts is not None:
+            cart_pks = list(
+                carts
+                .using(using)
+                .select_for_update()
+                .filter(pk__in=cart_pks)
+                .values_list('pk', flat=True)
+            )
+
+            if not cart_pks:
+                return 0
+
+        (
+            relations
+            .filter(
+                Q(cartgroup__cart_id__in=cart_pks)
+                | Q(cartitem__cart_id__in=cart_pks)
+            )
+            ._raw_delete(using)
+        )
+        (
+            CartGroup.objects.using(using)
+            .filter(cart_id__in=cart_pks)
+            ._raw_delete(using)
+        )
+        (
+            CartItem.objects.using(using)
+            .filter(cart_id__in=cart_pks)
+            ._raw_delete(using)
+        )
+        return (
+            Cart.objects.using(using)
+            .filter(pk__in=cart_pks)
+            ._raw_delete(using)
+        )
+
+
+@instrumented
+def delete_stale_carts(
+        *,
+        cutoff: datetime,
+        anonymous: bool = True,
+        empty: bool = True,
+        closed: bool = True,
+        batch_size: int = 1000,
+        sleep: float = 0,
+        dry_run: bool = False
+) -> int:
+    """
+    Delete stale carts (see `get_stale_carts`) in batches
+    (see `iterate_carts_pks`), sleeping between batches
+
+    Returns number of deleted carts or number of carts to delete
+    with `dry_run`.
+    """
+    carts = get_stale_carts(
+        cutoff=cutoff,
+        anonymous=anonymous,
+        empty=empty,
+        closed=closed
+    )
+    total = 0
+
+    for index, cart_pks in enumerate(
+            iterate_carts_pks(carts=carts, batch_size=batch_size)
+    ):
+        if index and sleep:
+            time.sleep(sleep)
+
+        if dry_run:
+            total += len(cart_pks)
+        else:
+            total += delete_carts(cart_pks=cart_pks, carts=carts)
+
+    return total
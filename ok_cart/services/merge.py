@@ -1,53 +1,111 @@
-from typing import Iterable, TYPE_CHECKING
+from typing import Iterable, List
 
+from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
 
+from ..entities import CartItemEntity
+from ..instrumentation import instrumented
+from ..models import Cart, CartGroup, CartItem
 from ..pipelines import run_post_add_pipelines
-from ..selectors import get_cart_items_by_cart
-from ..services import add_item_to_cart, clear_cart, update_cart_quantity_and_total_price
-
-if TYPE_CHECKING:
-    from apps.cart.models import Cart
+from ..services import add_items_to_cart, update_cart_quantity_and_total_price
+from ..services.prices import apply_cart_items_prices
+from ..services.version import touch_cart
 
 __all__ = (
     'merge',
+    'get_carts_items_entities',
+    'delete_carts_with_items',
 )
 
 
+@instrumented
 @transaction.atomic()
 def merge(*, carts: Iterable["Cart"], new_session_key: str = None):
+    """
+    Merge items of all given carts into the first one and delete others
+
+    Items of merged carts are fetched at once and added
+    with `add_items_to_cart`, so the number of queries doesn't depend
+    on the number of items.
+    """
     carts_iterator = iter(carts)
 
     main_cart = next(carts_iterator)
+    carts = [cart for cart in carts_iterator if cart.pk != main_cart.pk]
 
-    for cart in carts_iterator:
-        cart_items = get_cart_items_by_cart(cart=cart)
-
-        for cart_item in cart_items:
-            add_item_to_cart(
-                cart=main_cart,
-                user=main_cart.user,
-                content_type=cart_item.content_type,
-                object_id=cart_item.object_id,
-                content_object=cart_item.content_object,
-                quantity=cart_item.quantity,
-                parameters=cart_item.parameters
-            )
-
-        # clear and delete old cart
-        clear_cart(cart=cart)
-        cart.delete()
+    if carts:
+        add_items_to_cart(
+            cart=main_cart,
+            user=main_cart.user,
+            entities=get_carts_items_entities(carts=carts)
+        )
+        delete_carts_with_items(carts=carts)
 
     # apply all pipelines to new cart items
     run_post_add_pipelines(
         cart=main_cart,
         user=main_cart.user
     )
+    apply_cart_items_prices(
+        cart=main_cart,
+        user=main_cart.user
+    )
 
-    # refresh cart to get actual groups for correct calculations
-    main_cart.refresh_from_db()
     update_cart_quantity_and_total_price(cart=main_cart)
 
     if new_session_key:
-        main_cart.session_key = new_session_key
-        main_cart.save(update_fields=['session_key'])
+        touch_cart(
+            cart=main_cart,
+            session_key=new_session_key
+        )
+
+
+@instrumented
+def get_carts_items_entities(
+        *,
+        carts: Iterable['Cart']
+) -> List['CartItemEntity']:
+    """
+    Return entities of all items of given carts with a single query,
+    in carts order
+    """
+    carts_order = {cart.pk: index for index, cart in enumerate(carts)}
+    cart_items = sorted(
+        (
+            CartItem.objects
+            .filter(cart__in=list(carts_order))
+            .order_by('created_at', 'pk')
+            .only(
+                'cart_id',
+                'content_type_id',
+                'object_id',
+                'quantity',
+                'parameters'
+            )
+        ),
+        key=lambda cart_item: carts_order[cart_item.cart_id]
+    )
+
+    return [
+        CartItemEntity(
+            content_type=ContentType.objects.get_for_id(
+                cart_item.content_type_id
+            ),
+            object_id=cart_item.object_id,
+            quantity=cart_item.quantity,
+            parameters=cart_item.parameters
+        )
+        for cart_item in cart_items
+    ]
+
+
+@instrumented
+def delete_carts_with_items(*, carts: Iterable['Cart']) -> None:
+    """
+    Delete given carts with their groups and items
+    """
+    carts = list(carts)
+
+    CartGroup.objects.filter(cart__in=carts).delete()
+    CartItem.objects.filter(cart__in=carts).delete()
+    Cart.objects.filter(pk__in=[cart.pk for cart in carts]).delete()
@@ -0,0 +1,78 @@
+from collections import defaultdict
+from typing import List, TYPE_CHECKING
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+
+from .version import touch_cart
+from ..instrumentation import instrumented
+from ..models import CartItem
+from ..selectors import (
+    get_cart_items_by_cart,
+    prefetch_cart_items_content_objects
+)
+from ..settings import settings as cart_settings
+from ..utils import call_sync
+
+if TYPE_CHECKING:
+    from ..models import Cart
+
+__all__ = (
+    'apply_cart_items_prices',
+)
+
+
+@instrumented
+def apply_cart_items_prices(
+        *,
+        cart: 'Cart',
+        user: 'settings.AUTH_USER_MODEL',
+        **kwargs
+) -> List['CartItem']:
+    """
+    Resolve prices of all cart's items with `CART_PRICE_RESOLVER`,
+    called once per content type with prefetched content objects,
+    and save changed prices with a single query.
+    Cart is touched, if any price is changed.
+
+    Returns items with changed prices.
+    """
+    resolver = cart_settings.PRICE_RESOLVER
+
+    if resolver is None:
+        return []
+
+    cart_items = list(get_cart_items_by_cart(cart=cart))
+    prefetch_cart_items_content_objects(cart_items=cart_items)
+    cart_items_by_type = defaultdict(list)
+
+    for cart_item in cart_items:
+        content_type = ContentType.objects.get_for_id(
+            cart_item.content_type_id
+        )
+        cart_items_by_type[content_type].append(cart_item)
+
+    changed_items = []
+
+    for content_type, type_cart_items in cart_items_by_type.items():
+        prices = call_sync(
+            resolver,
+            cart=cart,
+            user=user,
+            content_type=content_type,
+            cart_items=type_cart_items,
+            **kwargs
+        ) or {}
+
+        for cart_item in type_cart_items:
+            price = prices.get(cart_item.pk)
+
+            if price is not None and price != cart_item.price:
+                cart_item.price = price
+                changed_items.append(cart_item)
+
+    if changed_items:
+        CartItem.objects.bulk_update(changed_items, ['price'])
+        touch_cart(cart=cart)
+
+    return changed_items
@@ -0,0 +1,57 @@
+from typing import TYPE_CHECKING, Union
+
+from django.db.models import F
+from django.utils.timezone import now
+
+from ..cache import invalidate_cart_cache
+from ..instrumentation import instrumented
+from ..models import Cart
+from ..settings import settings as cart_settings
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+__all__ = (
+    'touch_cart',
+)
+
+
+@instrumented
+def touch_cart(*, cart: Union['Cart', 'UUID', str], **fields) -> None:
+    """
+    Save given cart's fields, bump its version and invalidate cached data
+
+    Every service, which changes cart's content, touches the cart,
+    so the version can be used to detect changes.
+    """
+    cart_pk = cart.pk if isinstance(cart, Cart) else cart
+
+    (
+        Cart.objects
+        .filter(pk=cart_pk)
+        .update(
+            version=F('version') + 1,
+            updated_at=now(),
+            **fields
+        )
+    )
+
+    if isinstance(cart, Cart):
+        deferred_fields = cart.get_deferred_fields()
+
+        if 'version' not in deferred_fields:
+            cart.version += 1
+
+        for name, value in fields.items():
+            if not hasattr(value, 'resolve_expression'):
+                setattr(cart, name, value)
+
+        invalidate_cart_cache(cart=cart)
+    elif cart_settings.CACHE_ENABLED:
+        invalidate_cart_cache(
+            cart=(
+                Cart.objects
+                .only('user', 'session_key')
+                .get(pk=cart_pk)
+            )
+        )
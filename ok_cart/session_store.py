@@ -1,6 +1,7 @@
 from django.contrib.auth import SESSION_KEY, get_user_model
 from django.contrib.sessions.backends.db import SessionStore as DjangoSessionStore
 
+from .cache import invalidate_cart_cache
 from .selectors import get_or_create_user_cart
 from .settings import settings
 
@@ -48,3 +49,4 @@ class SessionStore(DjangoSessionStore):
             if user_cart:
                 user_cart.session_key = self.session_key
                 user_cart.save(update_fields=['session_key'])
+                invalidate_cart_cache(cart=user_cart)
@@ -1,13 +1,18 @@
-from collections import Iterable
+from collections.abc import Iterable
 from typing import Any
 
 from django.conf import settings as django_settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.module_loading import import_string
 
+from .consts import CART_RENDER_MODE_SERIALIZER
+
 __all__ = (
     'LazySetting',
     'LazySettings',
-    'settings'
+    'settings',
+    'reload_settings',
 )
 
 
@@ -36,12 +41,17 @@ class LazySetting:
         if obj is None:
             return self
 
-        setting = self.get_setting_value(obj)
-
-        if self.importable:
-            return self.import_setting(setting)
+        if not self.importable:
+            return self.get_setting_value(obj)
 
-        return setting
+        # importable settings are resolved once
+        # and reset on `setting_changed` signal
+        try:
+            return obj._resolved[self.name]
+        except KeyError:
+            value = self.import_setting(self.get_setting_value(obj))
+            obj._resolved[self.name] = value
+            return value
 
     def get_setting_value(self, obj):
         obj_settings = obj._settings
@@ -78,11 +88,31 @@ class LazySettings:
 
     def __init__(self, global_settings):
         self._settings = global_settings
+        self._resolved = {}
+
+    def clear_cache(self) -> None:
+        """
+        Reset resolved importable settings
+        """
+        self._resolved = {}
+
+    def warm_up(self) -> None:
+        """
+        Resolve all importable settings, e.g. in `AppConfig.ready()`,
+        so first requests don't import them
+        """
+        for name, value in vars(type(self)).items():
+            if isinstance(value, LazySetting) and value.importable:
+                getattr(self, name)
 
     ADD_PIPELINES = LazySetting(
         default=[],
         importable=True,
     )
+    ADD_BATCH_PIPELINES = LazySetting(
+        default=[],
+        importable=True,
+    )
     POST_ADD_PIPELINES = LazySetting(
         default=[],
         importable=True,
@@ -95,14 +125,24 @@ class LazySettings:
         default={},
         importable=True
     )
+    ELEMENT_QUERYSETS = LazySetting(
+        default={},
+        importable=True
+    )
     ELEMENT_ALLOWED_TYPES = LazySetting(
         default=(),
         importable=False
     )
+    PRICE_RESOLVER = LazySetting(
+        importable=True
+    )
     PRICE_PROCESSOR = LazySetting(
         default=lambda request, price: price,
         importable=True
     )
+    BATCH_PRICE_PROCESSOR = LazySetting(
+        importable=True
+    )
     BASE_API_VIEW = LazySetting(
         importable=True
     )
@@ -110,16 +150,65 @@ class LazySettings:
         default='ok_cart.selectors.get_cart_from_request',
         importable=True
     )
+    RENDER_MODE = LazySetting(
+        default=CART_RENDER_MODE_SERIALIZER,
+        importable=False
+    )
+    RAW_JSON_PARAMETERS = LazySetting(
+        default=False,
+        importable=False
+    )
     VIEW_RESPONSE_MODIFIER = LazySetting(
         default=lambda request, cart, serializer: serializer.data,
         importable=True
     )
+    INCREMENTAL_TOTALS = LazySetting(
+        default=False,
+        importable=False
+    )
+    CACHE_ENABLED = LazySetting(
+        default=False,
+        importable=False
+    )
+    CACHE_ALIAS = LazySetting(
+        default='default',
+        importable=False
+    )
+    CACHE_TIMEOUT = LazySetting(
+        default=60 * 60 * 24,
+        importable=False
+    )
     MERGE_ENABLED = LazySetting(
         default=False,
         importable=False
     )
+    METRICS_HOOK = LazySetting(
+        importable=True
+    )
+    QUERY_BUDGETS = LazySetting(
+        default={},
+        importable=False
+    )
+    QUERY_BUDGETS_RAISE = LazySetting(
+        default=False,
+        importable=False
+    )
+    SERVER_TIMING = LazySetting(
+        default=False,
+        importable=False
+    )
+    SLOW_LOG_THRESHOLD = LazySetting(
+        importable=False
+    )
 
 
 cart_settings = getattr(django_settings, 'CART', django_settings)
 
 settings = LazySettings(cart_settings)
+
+
+@receiver(setting_changed)
+def reload_settings(*, setting: str, **kwargs):
+    if setting.startswith('CART'):
+        settings._settings = getattr(django_settings, 'CART', django_settings)
+        settings.clear_cache()
@@ -0,0 +1,20 @@
+import asyncio
+from typing import Any, Callable
+
+__all__ = (
+    'call_sync',
+)
+
+
+def call_sync(func: Callable, **kwargs) -> Any:
+    """
+    Call given function from synchronous code,
+    coroutine functions are run with `async_to_sync`,
+    so they require `asgiref`
+    """
+    if asyncio.iscoroutinefunction(func):
+        from asgiref.sync import async_to_sync
+
+        return async_to_sync(func)(**kwargs)
+
+    return func(**kwargs)
@@ -0,0 +1,25 @@
+#!/usr/bin/env python
+"""
+Run ok_cart tests against a local Postgres:
+
+    OK_CART_DB_HOST=localhost python runtests.py [tests.test_module]
+"""
+import os
+import sys
+
+import django
+from django.conf import settings
+from django.test.utils import get_runner
+
+
+def main():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.settings')
+    django.setup()
+
+    runner = get_runner(settings)()
+    failures = runner.run_tests(sys.argv[1:] or ['tests'])
+    sys.exit(bool(failures))
+
+
+if __name__ == '__main__':
+    main()
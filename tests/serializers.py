@@ -0,0 +1,10 @@
+from rest_framework import serializers
+
+__all__ = (
+    'ElementSerializer',
+)
+
+
+class ElementSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField(source='name')
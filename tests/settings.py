@@ -0,0 +1,41 @@
+import os
+
+SECRET_KEY = 'ok-cart-tests'
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'rest_framework',
+    'ok_cart',
+]
+
+MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+]
+
+ROOT_URLCONF = 'tests.urls'
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('OK_CART_DB_NAME', 'ok_cart'),
+        'USER': os.environ.get('OK_CART_DB_USER', 'postgres'),
+        'PASSWORD': os.environ.get('OK_CART_DB_PASSWORD', ''),
+        'HOST': os.environ.get('OK_CART_DB_HOST', 'localhost'),
+        'PORT': os.environ.get('OK_CART_DB_PORT', ''),
+    }
+}
+
+DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
+
+USE_TZ = True
+
+# cart elements are objects of built-in models
+CART_ELEMENT_REPRESENTATION_SERIALIZERS = {
+    'auth.Group': 'tests.serializers.ElementSerializer',
+    'auth.Permission': 'tests.serializers.ElementSerializer',
+}
+
+CART_QUERY_BUDGETS_RAISE = True
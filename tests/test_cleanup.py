@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import Group, User
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from django.utils.timezone import now
+
+from ok_cart.models import Cart
+from ok_cart.services import (
+    add_item_to_cart,
+    close_cart,
+    delete_carts,
+    delete_stale_carts,
+    get_stale_carts,
+    touch_cart
+)
+
+
+class StaleCartsTestCase(TestCase):
+    def setUp(self):
+        self.cutoff = now() - timedelta(days=30)
+        element = Group.objects.create(name='element')
+        user = User.objects.create(username='user')
+        other_user = User.objects.create(username='other-user')
+        closed_user = User.objects.create(username='closed-user')
+
+        self.anonymous_cart = Cart.objects.create(session_key='anonymous')
+        self.empty_cart = Cart.objects.create(user=user)
+        self.closed_cart = Cart.objects.create(user=closed_user)
+        self.user_cart = Cart.objects.create(user=other_user)
+        close_cart(cart=self.closed_cart)
+
+        for cart in (self.closed_cart, self.user_cart):
+            add_item_to_cart(
+                cart=cart,
+                user=cart.user,
+                content_type=ContentType.objects.get_for_model(Group),
+                object_id=element.pk,
+                content_object=element,
+            )
+
+        old = self.cutoff - timedelta(days=1)
+        Cart.objects.update(created_at=old, updated_at=old)
+        self.fresh_cart = Cart.objects.create(session_key='fresh')
+
+    def get_stale_carts_pks(self, **kwargs):
+        return set(
+            get_stale_carts(cutoff=self.cutoff, **kwargs)
+            .values_list('pk', flat=True)
+        )
+
+    def test_stale_carts(self):
+        self.assertEqual(
+            self.get_stale_carts_pks(),
+            {
+                self.anonymous_cart.pk,
+                self.empty_cart.pk,
+                self.closed_cart.pk,
+            }
+        )
+        self.assertEqual(
+            self.get_stale_carts_pks(anonymous=False, closed=False),
+            {self.anonymous_cart.pk, self.empty_cart.pk}
+        )
+        self.assertEqual(
+            self.get_stale_carts_pks(
+                anonymous=False,
+                empty=False,
+                closed=False
+            ),
+            set()
+        )
+
+    def test_delete_stale_carts(self):
+        self.assertEqual(delete_stale_carts(cutoff=self.cutoff), 3)
+        self.assertEqual(
+            set(Cart.objects.values_list('pk', flat=True)),
+            {self.user_cart.pk, self.fresh_cart.pk}
+        )
+
+    def test_changed_carts_are_kept(self):
+        carts = get_stale_carts(cutoff=self.cutoff)
+        cart_pks = list(carts.values_list('pk', flat=True))
+        # cart is changed after its selection
+        touch_cart(cart=self.anonymous_cart)
+
+        self.assertEqual(delete_carts(cart_pks=cart_pks, carts=carts), 2)
+        self.assertTrue(
+            Cart.objects.filter(pk=self.anonymous_cart.pk).exists()
+        )
@@ -0,0 +1,83 @@
+import threading
+
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import Count, Sum
+from django.test import TransactionTestCase
+
+from ok_cart.models import Cart, CartItem
+from ok_cart.services import (
+    add_item_to_cart,
+    update_cart_quantity_and_total_price
+)
+
+
+class ConcurrentAddsTestCase(TransactionTestCase):
+    threads = 8
+    adds = 10
+
+    def setUp(self):
+        self.elements = [
+            Group.objects.create(name=f'element-{i}')
+            for i in range(3)
+        ]
+        self.content_type = ContentType.objects.get_for_model(Group)
+        self.cart = Cart.objects.create(session_key='concurrency')
+
+    def add_items(self, barrier: threading.Barrier, errors: list):
+        try:
+            barrier.wait()
+
+            for _ in range(self.adds):
+                for element in self.elements:
+                    add_item_to_cart(
+                        cart=Cart.objects.get(pk=self.cart.pk),
+                        user=None,
+                        content_type=self.content_type,
+                        object_id=element.pk,
+                        content_object=element,
+                    )
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    def test_concurrent_adds_to_the_same_cart(self):
+        barrier = threading.Barrier(self.threads)
+        errors = []
+        threads = [
+            threading.Thread(target=self.add_items, args=(barrier, errors))
+            for _ in range(self.threads)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
+        expected_quantity = self.threads * self.adds
+        items = (
+            CartItem.objects
+            .filter(groups__cart=self.cart)
+            .order_by()
+            .values('object_id')
+            .annotate(items=Count('pk'), quantity=Sum('quantity'))
+        )
+
+        self.assertEqual(len(items), len(self.elements))
+
+        for item in items:
+            self.assertEqual(item['items'], 1, item)
+            self.assertEqual(item['quantity'], expected_quantity, item)
+
+        update_cart_quantity_and_total_price(cart=self.cart)
+        self.cart.refresh_from_db()
+
+        self.assertEqual(
+            self.cart.quantity,
+            expected_quantity * len(self.elements)
+        )
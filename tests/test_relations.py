@@ -0,0 +1,133 @@
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from ok_cart.entities import CartItemEntity
+from ok_cart.models import Cart, CartItem
+from ok_cart.services import (
+    add_item_to_cart,
+    add_items_to_cart,
+    delete_cart_group,
+    update_cart_quantity_and_total_price
+)
+
+
+class CartGroupRelationsTestCase(TestCase):
+    def setUp(self):
+        self.elements = [
+            Group.objects.create(name=f'element-{i}')
+            for i in range(4)
+        ]
+        self.content_type = ContentType.objects.get_for_model(Group)
+        self.cart = Cart.objects.create(session_key='relations')
+        self.cart_item, self.cart_group = self.add(self.elements[0], 2)
+        self.other_cart_item, self.other_cart_group = self.add(self.elements[1], 1)
+        self.related_items = [
+            CartItem.objects.create(content_object=element, quantity=5)
+            for element in self.elements[2:]
+        ]
+        self.cart_group.relations.add(*self.related_items)
+
+    def add(self, element, quantity: int):
+        return add_item_to_cart(
+            cart=self.cart,
+            user=None,
+            content_type=self.content_type,
+            object_id=element.pk,
+            content_object=element,
+            quantity=quantity,
+        )
+
+    def get_cart_quantity(self) -> int:
+        update_cart_quantity_and_total_price(cart=self.cart)
+        self.cart.refresh_from_db()
+        return self.cart.quantity
+
+    def assertDetached(self, cart_items):
+        self.assertFalse(
+            CartItem.objects
+            .filter(
+                pk__in=[cart_item.pk for cart_item in cart_items],
+                cart__isnull=False
+            )
+            .exists()
+        )
+
+    def test_added_relations_are_in_cart(self):
+        self.assertEqual(self.get_cart_quantity(), 13)
+
+    def test_removed_relations_are_detached(self):
+        self.cart_group.relations.remove(self.related_items[0])
+
+        self.assertDetached(self.related_items[:1])
+        self.assertEqual(self.get_cart_quantity(), 8)
+
+    def test_reverse_removed_relations_are_detached(self):
+        cart_item = self.related_items[0]
+        cart_item.related_groups.remove(self.cart_group)
+
+        self.assertIsNone(cart_item.cart_id)
+        self.assertDetached([cart_item])
+
+    def test_cleared_relations_are_detached(self):
+        self.cart_group.relations.clear()
+
+        self.assertDetached(self.related_items)
+        self.assertEqual(self.get_cart_quantity(), 3)
+
+    def test_relations_of_other_groups_stay_in_cart(self):
+        self.other_cart_group.relations.add(self.related_items[1])
+        self.cart_group.relations.clear()
+
+        self.assertDetached(self.related_items[:1])
+        self.assertEqual(
+            CartItem.objects
+            .get(pk=self.related_items[1].pk)
+            .cart_id,
+            self.cart.pk
+        )
+
+    def test_deleted_base_relations_are_deleted(self):
+        add_items_to_cart(
+            cart=self.cart,
+            user=None,
+            entities=[
+                CartItemEntity(
+                    content_type=self.content_type,
+                    object_id=self.elements[0].pk,
+                    quantity=-2
+                )
+            ]
+        )
+
+        self.assertFalse(
+            CartItem.objects
+            .filter(pk__in=[item.pk for item in self.related_items])
+            .exists()
+        )
+        self.assertEqual(self.get_cart_quantity(), 1)
+
+    def test_deleted_group_relations_are_deleted(self):
+        delete_cart_group(cart_group=self.cart_group)
+
+        self.assertFalse(
+            CartItem.objects
+            .filter(pk__in=[item.pk for item in self.related_items])
+            .exists()
+        )
+        self.assertEqual(self.get_cart_quantity(), 1)
+
+    def test_deleted_group_shared_relations_are_kept(self):
+        self.other_cart_group.relations.add(self.related_items[1])
+        delete_cart_group(cart_group=self.cart_group)
+
+        self.assertFalse(
+            CartItem.objects.filter(pk=self.related_items[0].pk).exists()
+        )
+        self.assertEqual(
+            CartItem.objects
+            .get(pk=self.related_items[1].pk)
+            .cart_id,
+            self.cart.pk
+        )
+        self.assertEqual(self.get_cart_quantity(), 6)
@@ -0,0 +1,221 @@
+import json
+from decimal import Decimal
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ok_cart.api.renderers import CartJSONRenderer, RawJSON
+from ok_cart.api.representation import CartValuesRepresentation
+from ok_cart.api.serializers import CartRetrieveSerializer
+from ok_cart.api.views import CartRetrieveAPIView
+from ok_cart.entities import CartItemEntity
+from ok_cart.models import Cart, CartItem
+from ok_cart.services import (
+    add_items_to_cart,
+    update_cart_quantity_and_total_price
+)
+
+
+def double_price(*, request, price):
+    return price * 2
+
+
+def double_prices(*, request, prices, memo):
+    return [price * 2 for price in prices]
+
+
+class CustomCartRetrieveSerializer(CartRetrieveSerializer):
+    custom = serializers.SerializerMethodField()
+
+    class Meta(CartRetrieveSerializer.Meta):
+        fields = [*CartRetrieveSerializer.Meta.fields, 'custom']
+
+    def get_custom(self, cart: 'Cart'):
+        return True
+
+
+class CustomCartRetrieveAPIView(CartRetrieveAPIView):
+    serializer_class = CustomCartRetrieveSerializer
+
+
+class CartRetrieveAPIViewSerializerTestCase(TestCase):
+    def setUp(self):
+        self.session = import_module(settings.SESSION_ENGINE).SessionStore()
+        self.session.create()
+        Cart.objects.create(session_key=self.session.session_key)
+
+    def get_data(self) -> dict:
+        request = APIRequestFactory().get('/')
+        request.session = self.session
+        request.user = AnonymousUser()
+        response = CustomCartRetrieveAPIView.as_view()(request)
+        response.render()
+
+        return json.loads(response.content)
+
+    def test_view_serializer_is_used(self):
+        self.assertIs(self.get_data()['custom'], True)
+
+    @override_settings(CART_RENDER_MODE='values')
+    def test_values_mode_ignores_view_serializer(self):
+        self.assertNotIn('custom', self.get_data())
+
+
+class CartRepresentationParityTestCase(TestCase):
+    """
+    Values representation must match serializer's output
+    """
+
+    def setUp(self):
+        self.groups = [
+            Group.objects.create(name=f'element-{i}')
+            for i in range(3)
+        ]
+        self.permissions = list(Permission.objects.order_by('pk')[:3])
+        self.cart = Cart.objects.create(session_key='representation')
+        results = add_items_to_cart(
+            cart=self.cart,
+            user=None,
+            entities=[
+                CartItemEntity(
+                    content_type=ContentType.objects.get_for_model(element),
+                    object_id=element.pk,
+                    content_object=element,
+                    quantity=index + 1,
+                    parameters={'index': index} if index % 2 else None
+                )
+                for index, element in enumerate(
+                    [*self.groups, *self.permissions[:2]]
+                )
+            ]
+        )
+
+        for index, (_, cart_item, _) in enumerate(results):
+            cart_item.price = Decimal('1.25') * (index + 1)
+            cart_item.save(update_fields=['price'])
+
+        self.cart_group = results[0][2]
+        self.cart_group.parameters = {'text': 'gravé "x"', 'items': [1, None]}
+        self.cart_group.save(update_fields=['parameters'])
+        self.cart_group.relations.add(
+            CartItem.objects.create(
+                content_object=self.permissions[2],
+                quantity=2,
+                price=Decimal('3.10'),
+                parameters={'related': True}
+            ),
+            CartItem.objects.create(
+                content_object=self.groups[1],
+                quantity=1,
+                price=Decimal('0.99')
+            )
+        )
+        update_cart_quantity_and_total_price(cart=self.cart)
+
+    def get_context(self, renderer=None):
+        request = Request(APIRequestFactory().get('/'))
+        request.accepted_renderer = renderer or JSONRenderer()
+
+        return {'request': request}
+
+    def render(self, data, renderer=None):
+        data = json.loads((renderer or JSONRenderer()).render(data))
+        data['groups'].sort(key=lambda cart_group: cart_group['id'])
+
+        for cart_group in data['groups']:
+            cart_group['relations'].sort(
+                key=lambda cart_item: cart_item['id']
+            )
+
+        return data
+
+    def get_serializer_data(self, renderer=None):
+        cart = Cart.objects.with_elements().get(pk=self.cart.pk)
+
+        return self.render(
+            CartRetrieveSerializer(
+                instance=cart,
+                context=self.get_context(renderer)
+            ).data,
+            renderer
+        )
+
+    def get_values_data(self, renderer=None):
+        cart = Cart.objects.get(pk=self.cart.pk)
+
+        return self.render(
+            CartValuesRepresentation(
+                instance=cart,
+                context=self.get_context(renderer)
+            ).data,
+            renderer
+        )
+
+    def assertParity(self, renderer=None):
+        serializer_data = self.get_serializer_data(renderer)
+
+        self.assertEqual(len(serializer_data['groups']), 5)
+        self.assertEqual(self.get_values_data(renderer), serializer_data)
+
+        return serializer_data
+
+    def test_relations_and_parameters(self):
+        data = self.assertParity()
+        cart_group = next(
+            cart_group
+            for cart_group in data['groups']
+            if cart_group['id'] == self.cart_group.pk
+        )
+
+        self.assertEqual(len(cart_group['relations']), 2)
+        self.assertEqual(cart_group['parameters'], self.cart_group.parameters)
+
+    @override_settings(CART_PRICE_PROCESSOR=(
+        'tests.test_representation.double_price'
+    ))
+    def test_price_processor(self):
+        self.assertEqual(
+            self.assertParity()['total_price'],
+            float(self.cart.total_price * 2)
+        )
+
+    @override_settings(CART_BATCH_PRICE_PROCESSOR=(
+        'tests.test_representation.double_prices'
+    ))
+    def test_batch_price_processor(self):
+        self.assertEqual(
+            self.assertParity()['total_price'],
+            float(self.cart.total_price * 2)
+        )
+
+    def test_missing_content_objects(self):
+        # related and base items of deleted elements
+        self.groups[1].delete()
+        data = self.assertParity()
+
+        self.assertIn(
+            None,
+            [
+                cart_item['element']
+                for cart_group in data['groups']
+                for cart_item in (cart_group['base'], *cart_group['relations'])
+            ]
+        )
+
+    @override_settings(CART_RAW_JSON_PARAMETERS=True)
+    def test_raw_json_parameters(self):
+        renderer = CartJSONRenderer()
+        values_data = CartValuesRepresentation(
+            instance=Cart.objects.get(pk=self.cart.pk),
+            context=self.get_context(renderer)
+        ).data
+
+        self.assertIsInstance(values_data['groups'][0]['parameters'], RawJSON)
+        self.assertParity(renderer)
@@ -0,0 +1,46 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+
+from ok_cart.models import Cart
+from ok_cart.services import (
+    add_item_to_cart,
+    apply_cart_totals_delta,
+    delete_cart_group
+)
+
+
+@override_settings(CART_INCREMENTAL_TOTALS=True)
+class IncrementalTotalsTestCase(TestCase):
+    def setUp(self):
+        self.cart = Cart.objects.create(session_key='totals')
+        self.results = [
+            self.add(Group.objects.create(name=f'element-{i}'), i + 1)
+            for i in range(2)
+        ]
+
+    def add(self, element, quantity: int):
+        return add_item_to_cart(
+            cart=self.cart,
+            user=None,
+            content_type=ContentType.objects.get_for_model(Group),
+            object_id=element.pk,
+            content_object=element,
+            quantity=quantity,
+        )
+
+    def test_deferred_totals_are_not_double_counted(self):
+        cart = Cart.objects.only('uuid').get(pk=self.cart.pk)
+        apply_cart_totals_delta(cart=cart, quantity=2, price=Decimal('1.5'))
+
+        self.assertEqual(cart.quantity, 5)
+        self.assertEqual(cart.total_price, Decimal('1.5'))
+
+    def test_deleted_group_totals_are_subtracted(self):
+        _, cart_group = self.results[1]
+        delete_cart_group(cart_group=cart_group)
+        self.cart.refresh_from_db()
+
+        self.assertEqual(self.cart.quantity, 1)
@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import Group
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+
+from ok_cart.models import Cart, CartItem
+from ok_cart.services import (
+    add_item_to_cart,
+    apply_cart_items_prices,
+    update_cart_group_price
+)
+
+
+def resolve_prices(*, cart_items, **kwargs):
+    return {cart_item.pk: Decimal('9.99') for cart_item in cart_items}
+
+
+class CartVersionTestCase(TestCase):
+    """
+    Services, which change cart's content, bump its version
+    """
+
+    def setUp(self):
+        element = Group.objects.create(name='element')
+        self.cart = Cart.objects.create(session_key='version')
+        self.cart_item, self.cart_group = add_item_to_cart(
+            cart=self.cart,
+            user=None,
+            content_type=ContentType.objects.get_for_model(Group),
+            object_id=element.pk,
+            content_object=element,
+        )
+        self.version = self.get_version()
+
+    def get_version(self) -> int:
+        return Cart.objects.values_list('version', flat=True).get(
+            pk=self.cart.pk
+        )
+
+    @override_settings(
+        CART_PRICE_RESOLVER='tests.test_version.resolve_prices'
+    )
+    def test_apply_cart_items_prices(self):
+        apply_cart_items_prices(cart=self.cart, user=None)
+
+        self.assertGreater(self.get_version(), self.version)
+
+    def test_update_cart_group_price(self):
+        CartItem.objects.filter(pk=self.cart_item.pk).update(price=5)
+        update_cart_group_price(cart_group=self.cart_group)
+
+        self.assertEqual(self.cart_group.price, 5)
+        self.assertGreater(self.get_version(), self.version)